@@ -0,0 +1,53 @@
+"""Offline asset baker: writes sprite frames, HUD glyphs and the bunker shape into assets.pack"""
+import argparse
+import time
+from pathlib import Path
+
+import pygame
+
+from main import (AssetManager, Bunker, GlyphStrip, write_asset_pack, ASSET_PACK_PATH,
+                  HUD_FONT_SIZE, SPRITE_SHEET_PATH, SPRITE_SIZE)
+
+
+def collect_surfaces(sheet_path=SPRITE_SHEET_PATH):
+    """
+    Decode and rasterize everything the pack holds
+
+    Returns:
+        Dict of pack entry name to surface: "frame/<sheet offset>",
+        "glyph/<character>" and "bunker/shape"
+    """
+    sheet = AssetManager().image(sheet_path)
+    surfaces = {}
+    for offset in range(0, sheet.get_width() - SPRITE_SIZE + 1, SPRITE_SIZE):
+        frame = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE), pygame.SRCALPHA)
+        frame.blit(sheet, (0, 0), pygame.Rect(offset, 0, SPRITE_SIZE, SPRITE_SIZE))
+        surfaces[f"frame/{offset}"] = frame
+
+    strip = GlyphStrip(pygame.font.Font(None, HUD_FONT_SIZE))
+    for char, glyph in strip.glyphs.items():
+        surfaces[f"glyph/{char}"] = glyph
+
+    surfaces["bunker/shape"] = Bunker.render_shape()
+    return surfaces
+
+
+# --- Entry Point ---
+def main(argv=None):
+    """Bake the asset pack"""
+    parser = argparse.ArgumentParser(description="Bake VC-SpaceInvaders assets into a binary pack")
+    parser.add_argument("--output", metavar="PATH", default=str(ASSET_PACK_PATH),
+                        help=f"pack to write (default: {ASSET_PACK_PATH.name})")
+    args = parser.parse_args(argv)
+
+    pygame.font.init()
+    start = time.perf_counter()
+    surfaces = collect_surfaces()
+    write_asset_pack(args.output, surfaces, source=SPRITE_SHEET_PATH)
+    elapsed = time.perf_counter() - start
+    size = Path(args.output).stat().st_size
+    print(f"baked {len(surfaces)} surfaces ({size} bytes) into {args.output} in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
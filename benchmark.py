@@ -0,0 +1,366 @@
+"""Headless update/draw benchmarks for VC-SpaceInvaders with baseline regression checks"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from main import (AlienFormation, CollisionGrid, Game, GameConfig, ALIEN_BULLET_SPEED,
+                  BRUTE_FORCE_PAIRS, FRAME_ATLAS, SCREEN_WIDTH, SCREEN_HEIGHT, SIM_TICK_MS, SPRITE_SIZE,
+                  rect_boxes, rect_pairs)
+from spectator import mirror_check
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # fail when a metric is more than 25% slower than the baseline
+SEED = 1978
+STORM_BULLETS = 300  # alien bullets kept in flight by the bullet_storm scenario
+SPECTATOR_CONFIG = GameConfig(bullet_speed=-13, alien_bullet_speed=9)  # deliberately non-default
+
+
+# --- Scenario Fixtures ---
+def full_grid():
+    """Wave 1 with the complete 55-alien formation"""
+    return Game(headless=True, seed=SEED)
+
+
+def late_wave_sparse():
+    """Wave 8 with only three aliens left"""
+    game = Game(headless=True, seed=SEED)
+    game.wave_number = 8
+    game.aliens.kill(game.aliens.alive_indices()[3:])
+    return game
+
+
+def _spawn_bombs(game, rng, count, top, bottom):
+    """Add count alien bullets at random x and y in [top, bottom)"""
+    for x, y in zip(rng.integers(0, SCREEN_WIDTH, count), rng.integers(top, bottom, count)):
+        game.alien_bullets.add(game.alien_bullet_pool.acquire(int(x), int(y)))
+
+
+def bullet_storm():
+    """Full formation with STORM_BULLETS alien bullets spread over the screen"""
+    game = Game(headless=True, seed=SEED)
+    _spawn_bombs(game, np.random.default_rng(SEED), STORM_BULLETS, 0, SCREEN_HEIGHT)
+    game.player.lives = 10 ** 6  # keep the game running for the whole measurement
+    return game
+
+
+def refill_bullet_storm(game, rng):
+    """Replace the bullets that left the screen or hit something, entering from the top"""
+    _spawn_bombs(game, rng, STORM_BULLETS - len(game.alien_bullets), 0, ALIEN_BULLET_SPEED)
+
+
+def high_speed_wave():
+    """Wave 55, where the formation moves at its fastest"""
+    game = Game(headless=True, seed=SEED)
+    game.wave_number = 55
+    return game
+
+
+def huge_formation():
+    """A 40x50 grid of 2000 aliens"""
+    return Game(headless=True, seed=SEED, formation=(40, 50))
+
+
+def particle_storm():
+    """Full formation with the particle budget filled by long-lived debris"""
+    game = Game(headless=True, seed=SEED, particles=True)
+    for x in range(0, SCREEN_WIDTH, SCREEN_WIDTH // 16):
+        game.particles.emit(x, SCREEN_HEIGHT // 2, game.particles.budget // 16, (255, 160, 0),
+                            life=10 ** 6)
+    return game
+
+
+def upscaled_4k():
+    """Full formation drawn at the logical resolution and scaled into a 3840x2160 window"""
+    return Game(headless=True, seed=SEED, window_size=(3840, 2160))
+
+
+SCENARIOS = {
+    "full_grid": full_grid,
+    "late_wave_sparse": late_wave_sparse,
+    "bullet_storm": bullet_storm,
+    "high_speed_wave": high_speed_wave,
+    "huge_formation": huge_formation,
+    "particle_storm": particle_storm,
+    "upscaled_4k": upscaled_4k,
+}
+
+# Untimed hooks run after every measured tick to hold a scenario's load steady
+REFILLS = {
+    "bullet_storm": refill_bullet_storm,
+}
+
+
+# --- Collision Self-Check ---
+def _random_rects(rng, count, span=400, size=48):
+    """Random rects, some of them empty, around the origin"""
+    return [pygame.Rect(int(x), int(y), int(w), int(h)) for x, y, w, h in zip(
+        rng.integers(-span // 4, span, count), rng.integers(-span // 4, span, count),
+        rng.integers(0, size, count), rng.integers(0, size, count))]
+
+
+def collision_self_check(trials=200, seed=SEED):
+    """
+    Check every collision path against Rect.colliderect on randomized inputs
+
+    Covers CollisionGrid.pairs on both sides of BRUTE_FORCE_PAIRS, rect_pairs,
+    and AlienFormation.kill_colliding through both its lattice and grid paths
+    (hit order and survivors included).
+
+    Returns:
+        List of failure descriptions (empty when everything matches)
+    """
+    rng = np.random.default_rng(seed)
+    sheet = Game(headless=True, seed=seed).sprite_sheet
+    failures = []
+    for trial in range(trials):
+        queries = _random_rects(rng, int(rng.integers(1, 40)))
+        items = _random_rects(rng, int(rng.integers(1, 40)))
+        expected = [(q, i) for q, query in enumerate(queries) for i, item in enumerate(items)
+                    if query.colliderect(item)]
+        grid = CollisionGrid(cell_size=int(rng.integers(8, 128)))
+        grid.build(rect_boxes(items))
+        query_ids, item_ids = grid.pairs(rect_boxes(queries))
+        if list(zip(query_ids.tolist(), item_ids.tolist())) != expected:
+            failures.append(f"trial {trial}: CollisionGrid.pairs differs from colliderect")
+        if rect_pairs(queries, items) != expected:
+            failures.append(f"trial {trial}: rect_pairs differs from colliderect")
+
+        rows, cols = int(rng.integers(1, 12)), int(rng.integers(1, 16))
+        spacing = (int(rng.integers(1, 48)), int(rng.integers(1, 48)))
+        for count in (int(rng.integers(1, 8)), BRUTE_FORCE_PAIRS + 1):  # lattice, then grid
+            formation = AlienFormation(sheet, rows, cols, *spacing, offset_x=int(rng.integers(0, 80)),
+                                       offset_y=int(rng.integers(0, 80)))
+            dead = np.flatnonzero(rng.random(formation.size) < 0.3)
+            formation.kill(dead)
+            rects = _random_rects(rng, count, span=max(cols * spacing[0], rows * spacing[1]) + 100)
+            alive = formation.alive.copy()
+            expected_hits = []
+            for box_id, rect in enumerate(rects):
+                hit = False
+                for slot in np.flatnonzero(alive).tolist():
+                    alien = pygame.Rect(formation.origin_x + formation.offset_x[slot],
+                                        formation.origin_y + formation.offset_y[slot],
+                                        SPRITE_SIZE, SPRITE_SIZE)
+                    if rect.colliderect(alien):
+                        alive[slot] = False
+                        hit = True
+                if hit:
+                    expected_hits.append(box_id)
+            hits = formation.kill_colliding(rects)
+            if hits != expected_hits or not np.array_equal(formation.alive, alive):
+                path = "lattice" if count <= BRUTE_FORCE_PAIRS else "grid"
+                failures.append(f"trial {trial}: kill_colliding ({path}) differs from colliderect")
+    return failures
+
+
+# --- Atlas Self-Check ---
+def atlas_self_check(games=5):
+    """
+    Check that Games built without an asset pack share one sheet and its frames
+
+    Returns:
+        List of failure descriptions (empty when the atlas stays bounded)
+    """
+    Game(headless=True, seed=SEED, asset_pack=None)
+    sizes = {(len(FRAME_ATLAS.sheets), len(FRAME_ATLAS.frames))}
+    for _ in range(games):
+        Game(headless=True, seed=SEED, asset_pack=None)
+        sizes.add((len(FRAME_ATLAS.sheets), len(FRAME_ATLAS.frames)))
+    if len(sizes) > 1:
+        return [f"frame atlas grew across {games} Games (sheets, frames): {sorted(sizes)}"]
+    return []
+
+
+# --- Spectator Self-Check ---
+def spectator_self_check(ticks=2000):
+    """
+    Check that a spectator mirrors a game with non-default bullet speeds tick for tick
+
+    Returns:
+        List of failure descriptions (empty when the view never drifts)
+    """
+    mismatched = mirror_check(ticks, SPECTATOR_CONFIG, seed=SEED)
+    if mismatched:
+        return [f"spectator view differs from the game on {mismatched} of {ticks} ticks"]
+    return []
+
+
+# --- Measurement ---
+def measure(fixture, ticks, repeats, refill=None):
+    """
+    Time update() and draw() per tick on fresh copies of a scenario
+
+    refill(game, rng), if given, runs untimed after every tick.
+
+    Returns, per phase, the median and p95 microseconds per tick over all
+    samples and the best (lowest) per-repeat median, which is the most stable
+    figure and the one compared against the baseline.
+    """
+    samples = {"update": [], "draw": []}
+    repeat_medians = {"update": [], "draw": []}
+    rng = np.random.default_rng(SEED)
+    for _ in range(repeats):
+        game = fixture()
+        game.frame_time = SIM_TICK_MS
+        update_times = []
+        draw_times = []
+        for _ in range(ticks):
+            game.apply_input(0, True)
+            start = time.perf_counter()
+            game.update()
+            middle = time.perf_counter()
+            game.draw()
+            end = time.perf_counter()
+            update_times.append((middle - start) * 1e6)
+            draw_times.append((end - middle) * 1e6)
+            if refill is not None:
+                refill(game, rng)
+        for phase, times in (("update", update_times), ("draw", draw_times)):
+            samples[phase].extend(times)
+            repeat_medians[phase].append(statistics.median(times))
+
+    return {
+        phase: {
+            "best_us": min(repeat_medians[phase]),
+            "median_us": statistics.median(samples[phase]),
+            "p95_us": float(np.percentile(samples[phase], 95)),
+        }
+        for phase in samples
+    }
+
+
+def measure_startup(repeats):
+    """
+    Time Game construction up to the first drawn frame
+
+    Returned in the same shape as measure() so the baseline check covers
+    startup regressions as well.
+    """
+    times = []
+    for _ in range(repeats):
+        game = Game(headless=True, seed=SEED)
+        game.draw()
+        times.append(game.first_frame_shown() * 1000)
+    return {
+        "first_frame": {
+            "best_us": min(times),
+            "median_us": statistics.median(times),
+            "p95_us": float(np.percentile(times, 95)),
+        }
+    }
+
+
+def measure_hud(ticks):
+    """Play and draw the full grid for some ticks and return its HUD text cache counters"""
+    game = full_grid()
+    game.frame_time = SIM_TICK_MS
+    for _ in range(ticks):
+        game.apply_input(0, True)
+        game.update()
+        game.draw()
+    return game.hud_stats()
+
+
+def run_benchmarks(names, ticks, repeats):
+    """Run the selected scenarios and return a results dict"""
+    scenarios = {name: measure(SCENARIOS[name], ticks, repeats, REFILLS.get(name)) for name in names}
+    scenarios["startup"] = measure_startup(repeats)
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "ticks": ticks,
+        "repeats": repeats,
+        "scenarios": scenarios,
+        "hud": measure_hud(ticks),
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare best per-repeat median costs against a baseline
+
+    Returns a list of (scenario, phase, baseline_us, current_us, ratio) for
+    every metric that regressed by more than threshold.
+    """
+    regressions = []
+    for name, phases in results["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            continue
+        for phase, stats in phases.items():
+            before = reference[phase]["best_us"]
+            after = stats["best_us"]
+            ratio = after / before if before > 0 else float("inf")
+            if ratio > 1 + threshold:
+                regressions.append((name, phase, before, after, ratio))
+    return regressions
+
+
+# --- Entry Point ---
+def main(argv=None):
+    """Run the benchmark suite and check it against the stored baseline"""
+    parser = argparse.ArgumentParser(description="VC-SpaceInvaders benchmark suite")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--ticks", type=int, default=200, help="ticks per repeat (default: 200)")
+    parser.add_argument("--repeats", type=int, default=5, help="repeats per scenario (default: 5)")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON to PATH")
+    parser.add_argument("--baseline", metavar="PATH", default=str(BASELINE_PATH),
+                        help=f"baseline results to compare against (default: {BASELINE_PATH.name})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before failing, as a fraction (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    failures = collision_self_check() + atlas_self_check() + spectator_self_check()
+    for failure in failures:
+        print(f"SELF-CHECK {failure}")
+    if failures:
+        return 1
+
+    names = args.scenario or list(SCENARIOS)
+    results = run_benchmarks(names, args.ticks, args.repeats)
+
+    for name, phases in results["scenarios"].items():
+        print(f"{name:18} " + "   ".join(
+            f"{phase} {stats['best_us']:8.1f} us (p95 {stats['p95_us']:8.1f})"
+            for phase, stats in phases.items()))
+    hud = results["hud"]
+    print(f"hud text: {hud['renders']} renders, {hud['avoided']} avoided by the cache")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --save-baseline to create one")
+        return 1
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.threshold)
+    for name, phase, before, after, ratio in regressions:
+        print(f"REGRESSION {name}.{phase}: {before:.1f} us -> {after:.1f} us ({ratio:.2f}x)")
+    if regressions:
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%} against {baseline_path.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""Vectorized environment API for driving VC-SpaceInvaders from training agents"""
+import argparse
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import pygame
+
+from main import Game, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# --- Actions ---
+NOOP = 0
+LEFT = 1
+RIGHT = 2
+FIRE = 3
+LEFT_FIRE = 4
+RIGHT_FIRE = 5
+ACTION_COUNT = 6
+
+# (movement direction, fire) for each action
+ACTION_TABLE = (
+    (0, False),
+    (-1, False),
+    (1, False),
+    (0, True),
+    (-1, True),
+    (1, True),
+)
+
+# --- Observation Settings ---
+MAX_ALIEN_BULLETS = 16  # alien bullets reported in entity observations
+PIXEL_DOWNSCALE = 4  # framebuffer observations are SCREEN_SIZE / PIXEL_DOWNSCALE
+
+
+class SpaceInvadersEnv:
+    """
+    Single headless game exposed through reset/step
+
+    Each step applies an action to the player and advances the game by one
+    fixed simulated tick through Game.update, so the rules are exactly the
+    ones the windowed game uses.
+    """
+
+    def __init__(self, obs_type="entities", seed=None):
+        """
+        Args:
+            obs_type: "entities" for a flat float32 vector of entity positions,
+                "pixels" for a downscaled grayscale uint8 framebuffer
+            seed: Seed for the game's random number generator
+        """
+        if obs_type not in ("entities", "pixels"):
+            raise ValueError(f"Unknown observation type: {obs_type}")
+        self.obs_type = obs_type
+        self.game = Game(headless=True, seed=seed)
+
+    def reset(self, seed=None):
+        """Start a new game and return the first observation"""
+        self.game.reset(seed)
+        return self.observe()
+
+    def step(self, action):
+        """
+        Apply one action and advance the game by one tick
+
+        Returns:
+            (observation, reward, done, info) where reward is the score gained this tick
+        """
+        game = self.game
+        game.apply_input(*ACTION_TABLE[action])
+
+        score_before = game.score
+        game.simulate(1)
+        reward = game.score - score_before
+        done = not game.running
+        info = {"score": game.score, "lives": game.player.lives, "wave": game.wave_number}
+        return self.observe(), reward, done, info
+
+    def observe(self):
+        """Return the current observation"""
+        if self.obs_type == "pixels":
+            return self._observe_pixels()
+        return self._observe_entities()
+
+    def observation_shape(self):
+        """Return the shape of observations produced by this environment"""
+        return self.observe().shape
+
+    def _observe_entities(self):
+        """
+        Flat vector of normalized entity state:
+        player x, lives, UFO x (-1 if absent), player bullet x/y (-1 if absent),
+        then alive flag, x and y for every formation slot,
+        then x/y for up to MAX_ALIEN_BULLETS alien bullets (-1 padded)
+        """
+        game = self.game
+        aliens = game.aliens
+        ufo = game.ufo.sprite
+        bullet = next(iter(game.bullets), None)
+
+        header = np.array([
+            game.player.rect.centerx / SCREEN_WIDTH,
+            game.player.lives / game.config.player_lives,  # fraction of the starting lives
+            ufo.rect.centerx / SCREEN_WIDTH if ufo else -1.0,
+            bullet.rect.centerx / SCREEN_WIDTH if bullet else -1.0,
+            bullet.rect.centery / SCREEN_HEIGHT if bullet else -1.0,
+        ], dtype=np.float32)
+
+        bombs = np.full((MAX_ALIEN_BULLETS, 2), -1.0, dtype=np.float32)
+        for i, bomb in enumerate(game.alien_bullets.sprites()[:MAX_ALIEN_BULLETS]):
+            bombs[i] = (bomb.rect.centerx / SCREEN_WIDTH, bomb.rect.centery / SCREEN_HEIGHT)
+
+        return np.concatenate((
+            header,
+            aliens.alive.astype(np.float32),
+            (aliens.x / SCREEN_WIDTH).astype(np.float32),
+            (aliens.y / SCREEN_HEIGHT).astype(np.float32),
+            bombs.ravel(),
+        ))
+
+    def _observe_pixels(self):
+        """Render the frame offscreen and return it as a downscaled grayscale image"""
+        self.game.draw()
+        rgb = pygame.surfarray.pixels3d(self.game.screen)
+        small = rgb[::PIXEL_DOWNSCALE, ::PIXEL_DOWNSCALE]
+        gray = small.max(axis=2).T  # surfarray is (x, y); observations are (row, column)
+        del rgb
+        return np.ascontiguousarray(gray, dtype=np.uint8)
+
+
+# --- Process Pool Workers ---
+def _worker(connection, obs_type, seeds):
+    """Own a slice of environments in a child process and serve reset/step commands"""
+    envs = [SpaceInvadersEnv(obs_type, seed) for seed in seeds]
+    try:
+        while True:
+            command, payload = connection.recv()
+            if command == "reset":
+                connection.send([env.reset() for env in envs])
+            elif command == "step":
+                results = []
+                for env, action in zip(envs, payload):
+                    obs, reward, done, info = env.step(action)
+                    if done:
+                        # Auto-reset so every slot always holds a live game
+                        info["final_observation"] = obs
+                        obs = env.reset()
+                    results.append((obs, reward, done, info))
+                connection.send(results)
+            elif command == "close":
+                break
+    finally:
+        connection.close()
+
+
+class VectorEnv:
+    """
+    N independent games stepped together and spread over worker processes
+
+    step() takes one action per game and returns stacked NumPy arrays. Games
+    that end are reset automatically; their last observation is kept in
+    info["final_observation"].
+    """
+
+    def __init__(self, num_envs, obs_type="entities", processes=None, seed=0):
+        """
+        Args:
+            num_envs: Number of game instances
+            obs_type: Observation type passed to every SpaceInvadersEnv
+            processes: Worker process count (defaults to the CPU count, at most num_envs)
+            seed: Base seed; game i is seeded with seed + i
+        """
+        self.num_envs = num_envs
+        processes = min(processes or os.cpu_count() or 1, num_envs)
+        slices = np.array_split(np.arange(num_envs), processes)
+
+        self.connections = []
+        self.workers = []
+        self.slices = [len(part) for part in slices]
+        for part in slices:
+            parent, child = multiprocessing.Pipe()
+            seeds = [seed + int(i) for i in part]
+            worker = multiprocessing.Process(target=_worker, args=(child, obs_type, seeds),
+                                             daemon=True)
+            worker.start()
+            child.close()
+            self.connections.append(parent)
+            self.workers.append(worker)
+
+    def reset(self):
+        """Reset every game and return the stacked observations"""
+        for connection in self.connections:
+            connection.send(("reset", None))
+        observations = []
+        for connection in self.connections:
+            observations.extend(connection.recv())
+        return np.stack(observations)
+
+    def step(self, actions):
+        """
+        Apply one action per game and advance every game by one tick
+
+        Returns:
+            (observations, rewards, dones, infos) with arrays stacked along axis 0
+        """
+        actions = np.asarray(actions).tolist()
+        start = 0
+        for connection, count in zip(self.connections, self.slices):
+            connection.send(("step", actions[start:start + count]))
+            start += count
+
+        results = []
+        for connection in self.connections:
+            results.extend(connection.recv())
+        observations, rewards, dones, infos = zip(*results)
+        return (np.stack(observations),
+                np.array(rewards, dtype=np.float32),
+                np.array(dones, dtype=bool),
+                list(infos))
+
+    def close(self):
+        """Stop every worker process"""
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self.workers:
+            worker.join(timeout=1)
+        self.connections = []
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# --- Entry Point ---
+def main(argv=None):
+    """Measure vectorized environment throughput with random actions"""
+    parser = argparse.ArgumentParser(description="VC-SpaceInvaders vectorized environment benchmark")
+    parser.add_argument("--envs", type=int, default=os.cpu_count() or 1,
+                        help="number of game instances (default: CPU count)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--steps", type=int, default=1000, help="vector steps to run (default: 1000)")
+    parser.add_argument("--obs", choices=("entities", "pixels"), default="entities",
+                        help="observation type (default: entities)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    with VectorEnv(args.envs, obs_type=args.obs, processes=args.processes) as envs:
+        observations = envs.reset()
+        episodes = 0
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            observations, rewards, dones, infos = envs.step(rng.integers(ACTION_COUNT, size=args.envs))
+            episodes += int(dones.sum())
+        elapsed = time.perf_counter() - start
+
+    total = args.steps * args.envs
+    print(f"{total} env steps in {elapsed:.2f}s ({total / elapsed:.0f} steps/s), "
+          f"observation shape {observations.shape[1:]}, {episodes} episodes finished")
+
+
+if __name__ == "__main__":
+    main()
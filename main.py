@@ -1,13 +1,40 @@
 """VC-SpaceInvaders - A Space Invaders clone inspired by the classic arcade game"""
 import pygame
+import numpy as np
+import os
 import sys
+import time
 import random
+import math
+import gc
+import hashlib
+import json
+import struct
+import argparse
+import bisect
+import threading
+import mmap
+import queue
+import sqlite3
+import uuid
+import tracemalloc
 from pathlib import Path
 
 # --- Game Configuration Constants ---
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+SIM_TICK_MS = 1000 / FPS  # fixed simulation timestep, independent of the render rate
+MAX_CATCH_UP_TICKS = 5  # simulation ticks allowed per rendered frame before dropping time
+POOL_CAPACITY = 64  # idle sprites each object pool keeps for reuse
+PARTICLE_BUDGET = 2048  # particles alive at once; emissions beyond this are dropped
+COLLISION_CELL_SIZE = 64  # spatial hash cell size in pixels
+BRUTE_FORCE_PAIRS = 64  # up to this many (query, item) pairs, plain Rect tests replace the grid
+DIRTY_AREA_LIMIT = 0.5  # fraction of the screen above which dirty-rect mode flips the full frame
+HUD_FONT_SIZE = 36
+MIXER_FREQUENCY = 44100  # audio sample rate in Hz
+MIXER_BUFFER = 512  # audio buffer in samples (about 12 ms at 44.1 kHz)
+SFX_VOICES = 8  # mixer channels reserved for sound effects
 
 # --- Colors ---
 BLACK = (0, 0, 0)
@@ -24,6 +51,12 @@ ALIEN_MOVE_DOWN_AMOUNT = 10
 ALIEN_FIRE_INTERVAL = 1000  # milliseconds
 UFO_SPAWN_INTERVAL = 10000  # milliseconds
 ANIMATION_SPEED = 500  # milliseconds
+FORMATION_ROWS = 5
+FORMATION_COLS = 11
+CLASSIC_FORMATION_SIZE = 55  # the speed-up per kill is scaled to keep this formation's pacing
+ALIEN_SPEEDUP_PER_KILL = 0.02  # fraction of base speed gained per alien killed (classic formation)
+WAVE_SPEED_BONUS = 0.2  # alien speed added per wave
+PLAYER_LIVES = 3
 
 # --- Sprite Sheet Offsets ---
 SPRITE_SIZE = 24
@@ -38,18 +71,961 @@ ALIEN_SCORE = 10
 UFO_SCORE = 200
 
 # --- File Paths ---
-SPRITE_SHEET_PATH = "reference\\strip.png"
-MUSIC_PATH = "sound\\VC-SpaceInvader Main Theme.mp3"
-HIGHSCORE_FILE = "highscore.txt"
+BASE_DIR = Path(__file__).resolve().parent
+SPRITE_SHEET_PATH = BASE_DIR / "reference" / "strip.png"
+MUSIC_PATH = BASE_DIR / "sound" / "VC-SpaceInvader Main Theme.mp3"
+ASSET_PACK_PATH = BASE_DIR / "assets.pack"  # written by bake.py
+HIGHSCORE_FILE = BASE_DIR / "highscore.txt"  # legacy single-score file, imported once
+SCORES_PATH = BASE_DIR / "scores.db"
+LEADERBOARD_SIZE = 10
+
+
+# --- Asset Manager ---
+class AssetManager:
+    """
+    Resolves asset paths portably and loads assets only when first needed
+
+    Images are decoded on first request and asset packs are mapped once; both
+    are cached per process and shared by every manager, so all the Games in a
+    process use one sheet and one set of atlas frames. Music is loaded and started on a
+    background thread, together with the mixer itself and the sound effects,
+    so audio startup and decoding never delay the first frame.
+    """
+
+    packs = {}  # path -> AssetPack (None if unusable), shared by every manager in the process
+    images = {}  # (path, converted for a display) -> decoded image, shared likewise
+
+    def __init__(self, base_dir=BASE_DIR):
+        self.base_dir = Path(base_dir)
+        self.load_ms = {}  # asset path -> milliseconds spent loading it
+        self.music_thread = None
+        self.music_error = None  # exception raised while starting the music, if any
+
+    def path(self, name):
+        """Resolve a path relative to the game directory, accepting / or \\ separators"""
+        path = Path(str(name).replace("\\", "/"))
+        return path if path.is_absolute() else self.base_dir / path
+
+    def pack(self, name, source=SPRITE_SHEET_PATH):
+        """
+        Return the memory-mapped AssetPack at name
+
+        Returns None if it has not been baked, or, with a log line, if it is
+        unreadable or was baked from a different version of the source image;
+        callers then decode the source instead. Each path is checked once per
+        process.
+        """
+        path = self.path(name)
+        if not path.exists():
+            return None
+        if path not in AssetManager.packs:
+            start = time.perf_counter()
+            try:
+                pack = AssetPack(path)
+            except (OSError, ValueError) as error:
+                print(f"{path.name}: {error}; loading {Path(source).name} instead", file=sys.stderr)
+                pack = None
+            if pack is not None and pack.is_stale(self.path(source)):
+                print(f"{path.name} is stale ({Path(source).name} changed since it was baked; "
+                      f"re-run bake.py); loading {Path(source).name} instead", file=sys.stderr)
+                pack = None
+            AssetManager.packs[path] = pack
+            self.load_ms[path] = (time.perf_counter() - start) * 1000
+        return AssetManager.packs[path]
+
+    def image(self, name):
+        """Return the decoded image, converted for the display if one is open"""
+        path = self.path(name)
+        key = (path, pygame.display.get_surface() is not None)
+        image = AssetManager.images.get(key)
+        if image is None:
+            start = time.perf_counter()
+            image = pygame.image.load(str(path))
+            if key[1]:
+                image = image.convert_alpha()
+            AssetManager.images[key] = image
+            self.load_ms[path] = (time.perf_counter() - start) * 1000
+        return image
+
+    def start_music(self, name, loops=-1, sounds=None):
+        """
+        Start the mixer and play music on a background thread (once)
+
+        Args:
+            sounds: SoundEffects that opens the mixer with its settings and
+                decodes its effects on the same thread before the music starts
+        """
+        if self.music_thread is not None:
+            return
+        self.music_thread = threading.Thread(target=self._play_music,
+                                             args=(self.path(name), loops, sounds),
+                                             name="music-loader", daemon=True)
+        self.music_thread.start()
+
+    def _play_music(self, path, loops, sounds):
+        """Background thread body: initialize the mixer and effects, then load and play the music"""
+        start = time.perf_counter()
+        try:
+            if sounds is not None:
+                sounds.open(self)
+            elif not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.music.load(str(path))
+            pygame.mixer.music.play(loops)
+        except (pygame.error, OSError) as error:
+            self.music_error = error
+        self.load_ms[path] = (time.perf_counter() - start) * 1000
+
+    def stop_music(self):
+        """Stop the music, waiting briefly for a loader thread that is still running"""
+        if self.music_thread is not None:
+            self.music_thread.join(timeout=1.0)
+        if pygame.mixer.get_init():
+            pygame.mixer.music.stop()
+
+
+# --- Sound Effects ---
+def _sweep(rate, seconds, start_hz, end_hz, volume=0.5, square=True):
+    """Return a fading tone sliding from start_hz to end_hz as float samples"""
+    n = int(rate * seconds)
+    phase = 2 * np.pi * np.cumsum(np.linspace(start_hz, end_hz, n)) / rate
+    wave = np.sign(np.sin(phase)) if square else np.sin(phase)
+    return wave * np.linspace(1, 0, n) * volume
+
+
+def _warble(rate, seconds, hz, depth_hz, speed_hz, volume=0.2):
+    """Return a steady tone wobbling by depth_hz speed_hz times a second (loops seamlessly)"""
+    t = np.arange(int(rate * seconds)) / rate
+    frequency = hz + depth_hz * np.sin(2 * np.pi * speed_hz * t)
+    return np.sin(2 * np.pi * np.cumsum(frequency) / rate) * volume
+
+
+def _noise(rate, seconds, volume=0.5, seed=0):
+    """Return a decaying white-noise burst as float samples"""
+    n = int(rate * seconds)
+    return np.random.default_rng(seed).uniform(-1, 1, n) * np.exp(-np.linspace(0, 6, n)) * volume
+
+
+# name -> (priority, synthesizer(rate)); a new effect may steal a voice of equal or lower priority
+SOUND_EFFECTS = {
+    "shoot": (2, lambda rate: _sweep(rate, 0.12, 1400, 500, 0.25)),
+    "step0": (1, lambda rate: _sweep(rate, 0.08, 110, 100, 0.4)),
+    "step1": (1, lambda rate: _sweep(rate, 0.08, 98, 90, 0.4)),
+    "step2": (1, lambda rate: _sweep(rate, 0.08, 87, 80, 0.4)),
+    "step3": (1, lambda rate: _sweep(rate, 0.08, 82, 75, 0.4)),
+    "ufo": (3, lambda rate: _warble(rate, 0.4, 700, 150, 2.5)),
+    "explosion": (3, lambda rate: _noise(rate, 0.25, 0.4, seed=1)),
+    "ufo_hit": (4, lambda rate: _sweep(rate, 0.5, 1200, 200, 0.3, square=False) + _noise(rate, 0.5, 0.2, 2)),
+    "player_death": (5, lambda rate: _noise(rate, 0.8, 0.6, seed=3)),
+}
+MARCH_STEPS = ("step0", "step1", "step2", "step3")  # the alien march's four-note bass line
+
+
+class SoundEffects:
+    """
+    Pre-decoded sound effects on reserved mixer channels with voice stealing
+
+    open() initializes the mixer with the configured frequency and buffer
+    size, decodes every effect once into a pygame.mixer.Sound (from
+    sound/<name>.wav if present, else synthesized) and reserves a fixed set
+    of channels. play() never loads anything and only touches preallocated
+    per-voice lists: it takes a free voice, or steals the lowest-priority
+    (then oldest) one when the new effect is at least as important, and
+    drops the effect otherwise. Until open() has finished, play() does
+    nothing, so callers never wait for audio.
+    """
+
+    def __init__(self, frequency=MIXER_FREQUENCY, buffer=MIXER_BUFFER, voices=SFX_VOICES):
+        """
+        Args:
+            frequency: Mixer sample rate in Hz
+            buffer: Mixer buffer size in samples; smaller means lower latency but more CPU
+            voices: Channels reserved for effects
+        """
+        self.frequency = frequency
+        self.buffer = buffer
+        self.voices = voices
+        self.ready = False
+        self.sounds = {}  # name -> (Sound, priority)
+        self.channels = []
+        self.voice_sound = [None] * voices  # effect each voice last played
+        self.voice_priority = [0] * voices
+        self.voice_started = [0] * voices  # plays count when the voice started, for "oldest"
+        self.voice_looping = [False] * voices
+        self.looping = 0  # voices playing a looped effect
+        self.march_step = 0
+        self.plays = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.load_ms = 0.0
+
+    @property
+    def latency_ms(self):
+        """Mixer buffer length in milliseconds, the floor on effect latency"""
+        return self.buffer / self.frequency * 1000
+
+    def open(self, assets=None):
+        """Initialize the mixer and decode every effect (call off the frame loop)"""
+        start = time.perf_counter()
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(self.frequency, -16, 2, self.buffer)
+        rate, _, channels = pygame.mixer.get_init()
+        self.frequency = rate
+        for name, (priority, synthesize) in SOUND_EFFECTS.items():
+            path = assets.path(f"sound/{name}.wav") if assets is not None else None
+            if path is not None and path.exists():
+                sound = pygame.mixer.Sound(str(path))
+            else:
+                samples = np.clip(synthesize(rate) * 32767, -32768, 32767).astype(np.int16)
+                if channels > 1:
+                    samples = np.ascontiguousarray(np.repeat(samples[:, None], channels, axis=1))
+                sound = pygame.sndarray.make_sound(samples)
+            self.sounds[name] = (sound, priority)
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.voices))
+        pygame.mixer.set_reserved(self.voices)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.voices)]
+        self.load_ms = (time.perf_counter() - start) * 1000
+        self.ready = True
+
+    def play(self, name, loops=0):
+        """
+        Start an effect without blocking
+
+        Returns:
+            True if it got a voice, False if it was dropped (or audio is not ready)
+        """
+        if not self.ready:
+            return False
+        sound, priority = self.sounds[name]
+        channels = self.channels
+        voice = -1
+        for i in range(self.voices):
+            if not channels[i].get_busy():
+                voice = i
+                break
+        if voice < 0:
+            lowest = priority
+            for i in range(self.voices):
+                candidate = self.voice_priority[i]
+                if candidate < lowest or (candidate == lowest and (
+                        voice < 0 or self.voice_started[i] < self.voice_started[voice])):
+                    voice = i
+                    lowest = candidate
+            if voice < 0:
+                self.dropped += 1
+                return False
+            self.stolen += 1
+        if self.voice_looping[voice]:
+            self.looping -= 1
+        channels[voice].play(sound, loops)
+        self.plays += 1
+        self.voice_sound[voice] = name
+        self.voice_priority[voice] = priority
+        self.voice_started[voice] = self.plays
+        self.voice_looping[voice] = loops != 0
+        self.looping += loops != 0
+        return True
+
+    def march(self):
+        """Play the next note of the alien march"""
+        self.play(MARCH_STEPS[self.march_step])
+        self.march_step = (self.march_step + 1) % len(MARCH_STEPS)
+
+    def stop(self, name):
+        """Stop every looped voice playing an effect (free when nothing loops)"""
+        if not self.looping:
+            return
+        for i in range(self.voices):
+            if self.voice_looping[i] and self.voice_sound[i] == name:
+                self.channels[i].stop()
+                self.voice_looping[i] = False
+                self.looping -= 1
+
+    def stats(self):
+        """Return mixer settings and voice counters"""
+        return {
+            "frequency": self.frequency,
+            "buffer": self.buffer,
+            "latency_ms": self.latency_ms,
+            "voices": self.voices,
+            "effects": len(self.sounds),
+            "load_ms": self.load_ms,
+            "plays": self.plays,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+        }
+
+    def describe(self):
+        """One-line summary of stats()"""
+        stats = self.stats()
+        return (f"sound: {stats['frequency']} Hz, buffer {stats['buffer']} "
+                f"({stats['latency_ms']:.1f} ms), {stats['effects']} effects loaded in {stats['load_ms']:.1f} ms, "
+                f"{stats['plays']} plays on {stats['voices']} voices, {stats['stolen']} stolen, "
+                f"{stats['dropped']} dropped")
+
+
+# --- Asset Pack ---
+PACK_MAGIC = b"VCSP"
+PACK_VERSION = 3
+# Version 3 records a digest of the source image's bytes, so stale packs are detected
+PACK_HEADER = struct.Struct("<4sBI16s")  # magic, version, entry count, source digest
+PACK_DIGEST_SIZE = 16  # bytes of BLAKE2b digest kept per source
+
+
+def source_digest(path):
+    """Return the BLAKE2b digest of a file's contents, as stored in pack headers"""
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=PACK_DIGEST_SIZE).digest()
+PACK_ENTRY = struct.Struct("<4sHHQH")  # pixel format, width, height, data offset, name length
+PACK_ALIGN = 64  # pixel buffers start on cache-line boundaries
+PACK_FORMAT = "BGRA"  # memory order of SDL's ARGB8888 display format, so blits need no swizzle
+
+
+def write_asset_pack(path, surfaces, source=SPRITE_SHEET_PATH):
+    """
+    Write named surfaces into a pack of raw pixel buffers with an index
+
+    Args:
+        path: Output file
+        surfaces: Mapping of entry name to surface
+        source: Image the surfaces were cut from; a digest of its contents
+            is recorded so AssetPack.is_stale can tell when it changes
+    """
+    names = [name.encode("utf-8") for name in surfaces]
+    index_size = PACK_HEADER.size + sum(PACK_ENTRY.size + len(name) for name in names)
+    offset = -(-index_size // PACK_ALIGN) * PACK_ALIGN
+
+    index = bytearray(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(names), source_digest(source)))
+    pixels = []
+    for name, surface in zip(names, surfaces.values()):
+        width, height = surface.get_size()
+        index += PACK_ENTRY.pack(PACK_FORMAT.encode("ascii"), width, height, offset, len(name))
+        index += name
+        data = pygame.image.tobytes(surface, PACK_FORMAT)
+        padding = -len(data) % PACK_ALIGN
+        pixels.append(data + bytes(padding))
+        offset += len(data) + padding
+
+    with open(path, "wb") as file:
+        file.write(index)
+        file.write(bytes(-len(index) % PACK_ALIGN))
+        for data in pixels:
+            file.write(data)
+
+
+class AssetPack:
+    """
+    Baked sprite frames, HUD glyphs and the intact bunker shape
+
+    The pack is memory-mapped and each surface wraps its pixel buffer directly,
+    so nothing is decoded or copied at startup. The mapping is copy-on-write:
+    drawing onto a pack surface never modifies the file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(self.data) < PACK_HEADER.size:
+            raise ValueError("Asset pack is truncated")
+        magic, version, count, digest = PACK_HEADER.unpack_from(self.data)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError("Not a VC-SpaceInvaders asset pack (re-run bake.py)")
+        self.source_digest = digest  # of the source image when the pack was baked
+
+        self.index = {}  # name -> (pixel format, width, height, data offset)
+        pos = PACK_HEADER.size
+        for _ in range(count):
+            pixel_format, width, height, offset, name_length = PACK_ENTRY.unpack_from(self.data, pos)
+            pos += PACK_ENTRY.size
+            name = self.data[pos:pos + name_length].decode("utf-8")
+            pos += name_length
+            if offset + width * height * 4 > len(self.data):
+                raise ValueError("Asset pack is truncated")
+            self.index[name] = (pixel_format.decode("ascii"), width, height, offset)
+        self.surfaces = {}
+
+    def is_stale(self, source):
+        """
+        Return whether source's contents changed since the pack was baked
+
+        A missing source is not stale: the pack is then the only copy of the art.
+        """
+        try:
+            digest = source_digest(source)
+        except OSError:
+            return False
+        return digest != self.source_digest
+
+    def surface(self, name):
+        """Return the surface for an entry, wrapping the mapped pixels on first use"""
+        surface = self.surfaces.get(name)
+        if surface is None:
+            pixel_format, width, height, offset = self.index[name]
+            pixels = memoryview(self.data)[offset:offset + width * height * 4]
+            surface = pygame.image.frombuffer(pixels, (width, height), pixel_format)
+            self.surfaces[name] = surface
+        return surface
+
+    def _entries(self, prefix):
+        """Return {suffix: surface} for every entry named prefix + suffix"""
+        return {name[len(prefix):]: self.surface(name)
+                for name in self.index if name.startswith(prefix)}
+
+    def frame(self, offset):
+        """Return the SPRITE_SIZE x SPRITE_SIZE sprite frame at a sheet offset"""
+        return self.surface(f"frame/{offset}")
+
+    def glyphs(self):
+        """Return the HUD digit glyphs keyed by character"""
+        return self._entries("glyph/")
+
+    def bunker_shape(self):
+        """Return the intact bunker image, or None if the pack predates it"""
+        return self.surface("bunker/shape") if "bunker/shape" in self.index else None
+
+    def memory_bytes(self):
+        """Return the size of the mapped file"""
+        return len(self.data)
+
+
+# --- Score Persistence ---
+class ScoreStore:
+    """
+    SQLite-backed top-N leaderboard written from a background thread
+
+    Reads come from an in-memory copy of the leaderboard, loaded once at
+    startup. submit() updates that copy and queues the write, so it never
+    blocks the frame loop. The writer commits each batch in one transaction,
+    so a crash loses at most the writes still in the queue. Entries are keyed
+    by run, and a game in progress can checkpoint its score any number of
+    times.
+    """
+
+    def __init__(self, path=SCORES_PATH, size=LEADERBOARD_SIZE, legacy_path=HIGHSCORE_FILE):
+        """
+        Args:
+            path: SQLite database file
+            size: Number of leaderboard entries kept
+            legacy_path: Old highscore.txt imported when the database is empty
+        """
+        self.path = Path(path)
+        self.size = size
+        self.entries = {}  # run -> (score, wave, timestamp), top size entries only
+        self.pending = queue.Queue()
+        self.error = None  # last sqlite3.Error raised by the writer thread
+        self.writes = 0
+
+        connection = self._connect()
+        try:
+            rows = connection.execute("SELECT run, score, wave, recorded_at FROM scores "
+                                      "ORDER BY score DESC, recorded_at LIMIT ?", (size,)).fetchall()
+            if not rows:
+                rows = self._import_legacy(connection, legacy_path)
+        finally:
+            connection.close()
+        self.entries = {run: (score, wave, recorded_at) for run, score, wave, recorded_at in rows}
+
+        self.thread = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+        self.thread.start()
+
+    def _connect(self):
+        """Open the database, creating the table on first use"""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        connection.execute("CREATE TABLE IF NOT EXISTS scores (run TEXT PRIMARY KEY, "
+                           "score INTEGER NOT NULL, wave INTEGER NOT NULL, recorded_at REAL NOT NULL)")
+        return connection
+
+    def _import_legacy(self, connection, legacy_path):
+        """Carry a bare highscore.txt value over as the first leaderboard entry"""
+        try:
+            score = int(Path(legacy_path).read_text())
+        except (OSError, ValueError, TypeError):
+            return []
+        row = ("legacy", score, 0, time.time())
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)", row)
+        return [row]
+
+    @property
+    def highscore(self):
+        """Best score on the leaderboard (0 if empty)"""
+        return max((entry[0] for entry in self.entries.values()), default=0)
+
+    def leaderboard(self):
+        """Return [(score, wave, timestamp)] best first"""
+        return sorted(self.entries.values(), key=lambda entry: (-entry[0], entry[2]))
+
+    def submit(self, run, score, wave):
+        """Record the latest score of a run; returns immediately"""
+        entry = (score, wave, time.time())
+        self.entries[run] = entry
+        if len(self.entries) > self.size:
+            worst = min(self.entries, key=lambda key: (self.entries[key][0], -self.entries[key][2]))
+            del self.entries[worst]
+        if run in self.entries:
+            self.pending.put((run, *entry))
+
+    def close(self, timeout=2.0):
+        """Flush queued writes and stop the writer thread"""
+        self.pending.put(None)
+        self.thread.join(timeout)
+
+    def _write_loop(self):
+        """Writer thread: commit queued entries in batches and trim to the top N"""
+        connection = self._connect()
+        try:
+            running = True
+            while running:
+                batch = {}
+                item = self.pending.get()
+                while item is not None:
+                    batch[item[0]] = item
+                    try:
+                        item = self.pending.get_nowait()
+                    except queue.Empty:
+                        break
+                running = item is not None
+                if not batch:
+                    continue
+                try:
+                    with connection:
+                        connection.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)",
+                                               batch.values())
+                        connection.execute("DELETE FROM scores WHERE run NOT IN (SELECT run FROM scores "
+                                           "ORDER BY score DESC, recorded_at LIMIT ?)", (self.size,))
+                    self.writes += 1
+                except sqlite3.Error as error:
+                    self.error = error
+        finally:
+            connection.close()
+
+
+# --- Collision Broad Phase ---
+def _cell_keys(cx, cy):
+    """Pack grid cell coordinates (which may be negative) into sortable keys"""
+    return (cx + 0x8000) * 0x10000 + (cy + 0x8000)
+
+
+def rect_boxes(rects):
+    """Convert a sequence of pygame.Rect into an (n, 4) array of left, top, width, height"""
+    return np.array(rects, dtype=np.float64).reshape(-1, 4)
+
+
+def rect_pairs(queries, items):
+    """
+    Find every colliding (query, item) pair of pygame.Rects with Rect.collidelistall
+
+    The small-set counterpart of CollisionGrid.pairs: no arrays are built and
+    the pairs come out in the same order (by query, then item).
+    """
+    pairs = []
+    for query_id, query in enumerate(queries):
+        pairs.extend((query_id, item_id) for item_id in query.collidelistall(items))
+    return pairs
+
+
+class CollisionGrid:
+    """
+    Uniform grid broad phase over a set of axis-aligned boxes
+
+    Items are bucketed by the cell of their top-left corner and kept sorted by
+    cell key. A query box only looks up the cells an item overlapping it could
+    start in, then runs the exact pygame.Rect.colliderect test on those
+    candidates. All query boxes are resolved in one vectorized pass.
+    """
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.boxes = np.zeros((0, 4))
+        self.keys = np.zeros(0)
+        self.items = np.zeros(0, dtype=np.intp)
+        self.max_width = 0
+        self.max_height = 0
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def build(self, boxes):
+        """Rebuild the grid from an (n, 4) array of boxes; items are their row indices"""
+        self.boxes = boxes
+        self.keys = None  # bucketed on the first query that needs the grid
+
+    def _bucket(self):
+        """Sort items by the cell key of their top-left corner"""
+        size = self.cell_size
+        boxes = self.boxes
+        keys = _cell_keys(boxes[:, 0] // size, boxes[:, 1] // size)
+        self.items = keys.argsort(kind="stable")
+        self.keys = keys[self.items]
+        self.max_width = int(boxes[:, 2].max(initial=0))
+        self.max_height = int(boxes[:, 3].max(initial=0))
+
+    def _brute_force_pairs(self, queries):
+        """Test every (query, item) pair directly; cheaper than the grid for tiny sets"""
+        items = self.boxes.tolist()
+        query_ids, item_ids = [], []
+        for query_id, (q_left, q_top, q_width, q_height) in enumerate(queries.tolist()):
+            if q_width <= 0 or q_height <= 0:
+                continue
+            q_right = q_left + q_width
+            q_bottom = q_top + q_height
+            for item_id, (left, top, width, height) in enumerate(items):
+                if (left < q_right and left + width > q_left and top < q_bottom
+                        and top + height > q_top and width > 0 and height > 0):
+                    query_ids.append(query_id)
+                    item_ids.append(item_id)
+        return np.array(query_ids, dtype=np.intp), np.array(item_ids, dtype=np.intp)
+
+    def pairs(self, queries):
+        """
+        Find every colliding (query, item) pair
+
+        Args:
+            queries: (m, 4) array of query boxes
+
+        Returns:
+            (query indices, item indices) arrays sorted by query, then item
+        """
+        empty = np.zeros(0, dtype=np.intp)
+        if not len(self.boxes) or not len(queries):
+            return empty, empty
+        if len(self.boxes) * len(queries) <= BRUTE_FORCE_PAIRS:
+            return self._brute_force_pairs(queries)
+        if self.keys is None:
+            self._bucket()
+
+        # An item at x overlaps a query when left - item width < x < right
+        size = self.cell_size
+        left, top = queries[:, 0], queries[:, 1]
+        right, bottom = left + queries[:, 2], top + queries[:, 3]
+        first_cx = (left - self.max_width + 1) // size
+        first_cy = (top - self.max_height + 1) // size
+        span_x = (right - 1) // size - first_cx
+        last_cy = np.maximum((bottom - 1) // size, first_cy)
+        query_ids, lows, highs = [], [], []
+        for dx in range(int(span_x.max(initial=0)) + 1):
+            ids = np.flatnonzero(span_x >= dx)
+            column = first_cx[ids] + dx
+            query_ids.append(ids)
+            lows.append(self.keys.searchsorted(_cell_keys(column, first_cy[ids]), side="left"))
+            highs.append(self.keys.searchsorted(_cell_keys(column, last_cy[ids]), side="right"))
+        query_ids = np.concatenate(query_ids)
+        lows = np.concatenate(lows)
+        counts = np.concatenate(highs) - lows
+        total = int(counts.sum())
+        if not total:
+            return empty, empty
+
+        # Expand (query, key range) into (query, item) candidates
+        pair_queries = np.repeat(query_ids, counts)
+        starts = np.repeat(lows - (np.cumsum(counts) - counts), counts)
+        pair_items = self.items[starts + np.arange(total)]
+
+        # Narrow phase, with colliderect's rule that empty rects never collide
+        boxes = self.boxes[pair_items]
+        q = queries[pair_queries]
+        overlap = ((boxes[:, 0] < q[:, 0] + q[:, 2]) & (boxes[:, 0] + boxes[:, 2] > q[:, 0])
+                   & (boxes[:, 1] < q[:, 1] + q[:, 3]) & (boxes[:, 1] + boxes[:, 3] > q[:, 1])
+                   & (boxes[:, 2] > 0) & (boxes[:, 3] > 0) & (q[:, 2] > 0) & (q[:, 3] > 0))
+        pair_queries = pair_queries[overlap]
+        pair_items = pair_items[overlap]
+        order = np.lexsort((pair_items, pair_queries))
+        return pair_queries[order], pair_items[order]
+
+
+# --- Sprite Frame Atlas ---
+class FrameAtlas:
+    """
+    Process-wide cache of sprite frames keyed by sprite sheet and offset
+
+    Each frame is cut out of the sheet (and convert_alpha'd when a display mode
+    is set) the first time it is requested; every later request shares it.
+    When the "sheet" is an AssetPack the baked frame is used as is. Several
+    Games in one process can use different sheets without evicting each
+    other's frames.
+    """
+
+    def __init__(self):
+        self.sheets = {}  # id(sheet) -> sheet, kept alive so a cached id is never reused
+        self.frames = {}  # (id(sheet), offset) -> frame
+        self.masks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def frame(self, sprite_sheet, offset):
+        """Return the shared SPRITE_SIZE x SPRITE_SIZE frame at the given offset"""
+        key = (id(sprite_sheet), offset)
+        image = self.frames.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        self.sheets[id(sprite_sheet)] = sprite_sheet
+        if isinstance(sprite_sheet, AssetPack):
+            image = sprite_sheet.frame(offset)
+        else:
+            image = pygame.Surface((SPRITE_SIZE, SPRITE_SIZE), pygame.SRCALPHA)
+            image.blit(sprite_sheet, (0, 0), pygame.Rect(offset, 0, SPRITE_SIZE, SPRITE_SIZE))
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+        self.frames[key] = image
+        return image
+
+    def mask(self, sprite_sheet, offset):
+        """Return the shared collision mask of the frame at the given offset"""
+        key = (id(sprite_sheet), offset)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.frame(sprite_sheet, offset))
+            self.masks[key] = mask
+        return mask
+
+    def memory_bytes(self):
+        """Return the pixel memory held by cached frames"""
+        return sum(image.get_width() * image.get_height() * image.get_bytesize()
+                   for image in self.frames.values())
+
+    def stats(self):
+        """Return hit/miss and memory counters"""
+        return {
+            "frames": len(self.frames),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self.memory_bytes(),
+        }
+
+
+FRAME_ATLAS = FrameAtlas()
+
+
+# --- Particle Effects ---
+PARTICLE_SIZE = 2  # pixels per side
+PARTICLE_FADE_LEVELS = 4  # alpha steps a particle fades through over its life
+PARTICLE_GRAVITY = 0.05  # pixels per tick added to vertical speed
+
+
+class ParticleSystem:
+    """
+    Explosion debris in preallocated NumPy arrays with a hard budget
+
+    Live particles are packed at the front of the arrays. update() moves
+    them all in one vectorized pass and compacts out the dead ones; draw()
+    renders them with a single batched blit of shared pre-faded squares.
+    Emissions beyond the budget are dropped, so the cost per frame is
+    bounded whatever happens on screen. The system has its own random
+    generator so effects never disturb the game's.
+    """
+
+    def __init__(self, budget=PARTICLE_BUDGET, seed=0):
+        self.budget = budget
+        self.x = np.zeros(budget, dtype=np.float32)
+        self.y = np.zeros(budget, dtype=np.float32)
+        self.vx = np.zeros(budget, dtype=np.float32)
+        self.vy = np.zeros(budget, dtype=np.float32)
+        self.life = np.zeros(budget, dtype=np.float32)  # milliseconds left
+        self.max_life = np.ones(budget, dtype=np.float32)
+        self.color = np.zeros(budget, dtype=np.uint8)  # index into self.sprites
+        self.count = 0
+        self.dropped = 0
+        self.rng = np.random.default_rng(seed)
+        self.colors = {}  # RGB -> index into self.sprites
+        self.sprites = []  # per color, one square per fade level (faintest first)
+        self.update_ms = 0.0
+        self.draw_ms = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def _color_index(self, color):
+        """Return the sprite index for a color, rendering its fade levels on first use"""
+        index = self.colors.get(color)
+        if index is None:
+            index = len(self.sprites)
+            levels = []
+            for level in range(1, PARTICLE_FADE_LEVELS + 1):
+                square = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE), pygame.SRCALPHA)
+                square.fill((*color, 255 * level // PARTICLE_FADE_LEVELS))
+                levels.append(square)
+            self.sprites.append(levels)
+            self.colors[color] = index
+        return index
+
+    def emit(self, x, y, count, color, speed=3.0, life=500.0):
+        """
+        Spawn a burst of particles flying out from (x, y)
+
+        Args:
+            count: Particles wanted; whatever does not fit in the budget is dropped
+            color: RGB tuple
+            speed: Maximum initial speed in pixels per tick
+            life: Maximum lifetime in milliseconds
+        """
+        start = self.count
+        wanted = count
+        count = min(wanted, self.budget - start)
+        self.dropped += wanted - count
+        if count <= 0:
+            return
+        end = start + count
+        rng = self.rng
+        angle = rng.uniform(0, 2 * np.pi, count)
+        velocity = rng.uniform(0.2, 1.0, count) * speed
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = np.cos(angle) * velocity
+        self.vy[start:end] = np.sin(angle) * velocity
+        lifetimes = rng.uniform(0.5, 1.0, count) * life
+        self.life[start:end] = lifetimes
+        self.max_life[start:end] = lifetimes
+        self.color[start:end] = self._color_index(color)
+        self.count = end
+
+    def update(self, elapsed):
+        """Advance every live particle by elapsed milliseconds and drop the expired ones"""
+        if not self.count:
+            self.update_ms = 0.0
+            return
+        start = time.perf_counter()
+        n = self.count
+        x, y, vx, vy, life = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.life[:n]
+        x += vx
+        y += vy
+        vy += PARTICLE_GRAVITY
+        life -= elapsed
+        alive = life > 0
+        live = int(np.count_nonzero(alive))
+        if live < n:
+            for array in (self.x, self.y, self.vx, self.vy, self.life, self.max_life, self.color):
+                array[:live] = array[:n][alive]
+            self.count = live
+        self.update_ms = (time.perf_counter() - start) * 1000
+
+    def draw(self, surface):
+        """
+        Blit every live particle in one batched call
+
+        Returns:
+            The rect enclosing everything drawn
+        """
+        n = self.count
+        if not n:
+            self.draw_ms = 0.0
+            return pygame.Rect(0, 0, 0, 0)
+        start = time.perf_counter()
+        x = self.x[:n].astype(np.int32)
+        y = self.y[:n].astype(np.int32)
+        fade = (self.life[:n] * PARTICLE_FADE_LEVELS / self.max_life[:n]).astype(np.intp)
+        np.minimum(fade, PARTICLE_FADE_LEVELS - 1, out=fade)
+        sprites = self.sprites
+        batch = [(sprites[color][level], (left, top)) for color, level, left, top in
+                 zip(self.color[:n].tolist(), fade.tolist(), x.tolist(), y.tolist())]
+        if hasattr(surface, "fblits"):  # pygame-ce
+            surface.fblits(batch)
+        else:
+            surface.blits(batch, doreturn=False)
+        left, top = int(x.min()), int(y.min())
+        self.draw_ms = (time.perf_counter() - start) * 1000
+        return pygame.Rect(left, top, int(x.max()) + PARTICLE_SIZE - left,
+                           int(y.max()) + PARTICLE_SIZE - top)
+
+    def clear(self):
+        """Remove every particle"""
+        self.count = 0
+
+
+# --- Framebuffer Scaling ---
+class FramebufferScaler:
+    """
+    Presents a logical-resolution framebuffer in a window of any size
+
+    The scene is always drawn at SCREEN_WIDTH x SCREEN_HEIGHT, so drawing
+    costs the same whatever the window size; only this once-per-frame
+    scale touches window-sized memory. By default the framebuffer is
+    scaled by the largest whole factor that fits (nearest neighbour, crisp
+    pixel art) and centered. With integer=False it is stretched to fit the
+    window while keeping its aspect ratio. Either way it is scaled straight
+    into a cached subsurface of the window, so presenting allocates nothing.
+    """
+
+    def __init__(self, source, target, integer=True):
+        """
+        Args:
+            source: Logical-resolution framebuffer the game draws into
+            target: Window (or offscreen window-sized) surface
+            integer: Scale by a whole factor and letterbox the rest
+        """
+        self.source = source
+        self.target = target
+        source_w, source_h = source.get_size()
+        target_w, target_h = target.get_size()
+        factor = min(target_w // source_w, target_h // source_h)
+        if integer and factor >= 1:
+            self.factor = factor  # whole-number factor, None when fractional
+            size = (source_w * factor, source_h * factor)
+        else:
+            self.factor = None
+            fit = min(target_w / source_w, target_h / source_h)
+            size = (max(1, round(source_w * fit)), max(1, round(source_h * fit)))
+        self.rect = pygame.Rect((0, 0), size)
+        self.rect.center = (target_w // 2, target_h // 2)
+        self.dest = target.subsurface(self.rect)
+        target.fill(BLACK)  # letterbox bars, never drawn over again
+
+    def present(self):
+        """Scale the whole framebuffer into the window"""
+        if self.factor == 1:
+            self.dest.blit(self.source, (0, 0))
+        else:
+            pygame.transform.scale(self.source, self.rect.size, self.dest)
+
+    def present_rects(self, rects):
+        """
+        Scale only the given framebuffer areas (integer factors only)
+
+        Returns:
+            The matching window rects, for pygame.display.update
+        """
+        factor = self.factor
+        bounds = self.source.get_rect()
+        scaled = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect.width or not rect.height:
+                continue
+            window_rect = pygame.Rect(self.rect.x + rect.x * factor, self.rect.y + rect.y * factor,
+                                      rect.width * factor, rect.height * factor)
+            pygame.transform.scale(self.source.subsurface(rect), window_rect.size,
+                                   self.target.subsurface(window_rect))
+            scaled.append(window_rect)
+        return scaled
+
+
+def interpolated_rect(sprite, alpha):
+    """
+    Return where to draw a sprite between its previous and current tick position
+
+    Sprites without a stored previous position (e.g. spawned this tick) are
+    drawn where they are.
+    """
+    previous = getattr(sprite, "previous_topleft", None)
+    if previous is None or alpha >= 1:
+        return sprite.rect
+    rect = sprite.rect.copy()
+    rect.topleft = (round(previous[0] + (rect.x - previous[0]) * alpha),
+                    round(previous[1] + (rect.y - previous[1]) * alpha))
+    return rect
 
 
 # --- Base Drawable Class (Inspired by reference implementation) ---
 class Drawable(pygame.sprite.Sprite):
-    """Base class for all drawable game objects with sprite animation support"""
+    """Base class for game objects drawn from sprite sheet frames"""
 
     def __init__(self, sprite_sheet, offset0, offset1=None):
         """
-        Initialize a drawable object with sprite animation
+        Initialize a drawable object with its sprite frames
 
         Args:
             sprite_sheet: The sprite sheet surface
@@ -60,118 +1036,581 @@ class Drawable(pygame.sprite.Sprite):
         if offset1 is None:
             offset1 = offset0
 
-        # Create two animation frames
+        # Animation frames are shared through the atlas, never modified per instance
         self.images = (
-            pygame.Surface((SPRITE_SIZE, SPRITE_SIZE), pygame.SRCALPHA),
-            pygame.Surface((SPRITE_SIZE, SPRITE_SIZE), pygame.SRCALPHA)
+            FRAME_ATLAS.frame(sprite_sheet, offset0),
+            FRAME_ATLAS.frame(sprite_sheet, offset1)
         )
 
-        # Extract frames from sprite sheet
-        self.images[0].blit(sprite_sheet, (0, 0), pygame.Rect(offset0, 0, SPRITE_SIZE, SPRITE_SIZE))
-        self.images[1].blit(sprite_sheet, (0, 0), pygame.Rect(offset1, 0, SPRITE_SIZE, SPRITE_SIZE))
-
         self.image_index = 0
         self.image = self.images[self.image_index]
         self.rect = self.image.get_rect()
-        self.animation_timer = pygame.time.get_ticks()
-
-    def animate(self, speed=ANIMATION_SPEED):
-        """Toggle between animation frames based on time"""
-        now = pygame.time.get_ticks()
-        if now - self.animation_timer > speed:
-            self.image_index = (self.image_index + 1) % 2
-            self.image = self.images[self.image_index]
-            self.animation_timer = now
 
 
 # --- Player Class ---
 class Player(Drawable):
     """Player ship controlled by the user"""
 
-    def __init__(self, sprite_sheet):
+    def __init__(self, sprite_sheet, speed=PLAYER_SPEED, lives=PLAYER_LIVES):
         super().__init__(sprite_sheet, PLAYER_OFFSET)
         self.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50)
-        self.speed = PLAYER_SPEED
-        self.lives = 3
+        self.speed = speed
+        self.lives = lives
+        self.direction = 0  # -1 left, 0 idle, 1 right (set by input handling)
 
     def update(self):
-        """Handle player movement based on keyboard input"""
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] and self.rect.left > 0:
+        """Move the player in the current input direction"""
+        if self.direction < 0 and self.rect.left > 0:
             self.rect.x -= self.speed
-        if keys[pygame.K_RIGHT] and self.rect.right < SCREEN_WIDTH:
+        if self.direction > 0 and self.rect.right < SCREEN_WIDTH:
             self.rect.x += self.speed
 
-    def shoot(self, bullets, sprite_sheet):
-        """Fire a bullet if none currently active"""
+    def shoot(self, bullets, bullet_pool, sounds=None):
+        """Fire a bullet from the pool if none currently active"""
         if not bullets:
-            bullet = Bullet(self.rect.centerx, self.rect.top, sprite_sheet)
+            bullet = bullet_pool.acquire(self.rect.centerx, self.rect.top)
             bullets.add(bullet)
+            if sounds is not None:
+                sounds.play("shoot")
 
     def lose_life(self):
         """Decrease life count and reset position"""
         self.lives -= 1
         self.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50)
+        self.previous_topleft = None  # don't interpolate across the respawn
+
+# --- Alien Formation Class ---
+def offset_for_row(row):
+    """Return the sprite sheet offset for an alien in the given row"""
+    if row == 0:
+        return TOP_ALIEN_OFFSET
+    elif 1 <= row <= 2:
+        return MIDDLE_ALIEN_OFFSET
+    else:  # Rows 3 & 4
+        return TOP_ALIEN_OFFSET
+
+
+def _round_half_away(value):
+    """Round like pygame.Rect coordinate assignment (halves away from zero)"""
+    return math.copysign(math.floor(abs(value) + 0.5), value)
+
+
+class AlienFormation:
+    """
+    The alien grid as a rigid body with per-slot state in NumPy arrays
+
+    Aliens never move relative to each other, so the formation is an origin
+    plus fixed per-slot offsets: moving it is O(1). Kills incrementally
+    maintain a per-column index (live count and bottom row) and per-row live
+    counts. Those keep the formation bounds cached, so the edge test, the
+    game-over check and "bottom alien of a random column fires" are O(1) per
+    frame however large the grid is; finding the lowest alien scans one row.
+    """
+
+    def __init__(self, sprite_sheet, rows=FORMATION_ROWS, cols=FORMATION_COLS, spacing_x=40,
+                 spacing_y=40, offset_x=60, offset_y=50):
+        grid_rows, grid_cols = np.divmod(np.arange(rows * cols), cols)
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.spacing_x = spacing_x
+        self.spacing_y = spacing_y
+        self.row = grid_rows.astype(np.int16)
+        self.col = grid_cols.astype(np.int16)
+        self.offset_x = (grid_cols * spacing_x).astype(np.float64)  # slot positions relative to the origin
+        self.offset_y = (grid_rows * spacing_y).astype(np.float64)
+        self.origin_x = float(offset_x)  # top-left of slot 0, always a whole pixel
+        self.origin_y = float(offset_y)
+        self.alive = np.ones(self.size, dtype=bool)
+        self.frame = np.zeros(self.size, dtype=np.uint8)
+        self.count = self.size
+        self.animation_timer = 0
+        self.grid = CollisionGrid()  # live slots in formation-local coordinates
+        self.grid_slots = None  # slots indexed by self.grid, rebuilt once half of them have died
+        self.previous_origin = None  # origin at the start of the current tick, for interpolation
+
+        # Column index and cached bounds, updated only when aliens die
+        self.column_count = [rows] * cols
+        self.column_bottom = [rows - 1] * cols  # lowest live row of each column
+        self.row_count = [cols] * rows
+        self.live_columns = list(range(cols))  # unordered; swap-removed when a column empties
+        self.column_position = list(range(cols))  # index of each column in live_columns
+        self.left_column = 0
+        self.right_column = cols - 1
+        self.top_row = 0
+        self.bottom_row = rows - 1
+
+        # Both animation frames for each row, shared by every alien in it
+        self.row_images = []
+        for row in range(rows):
+            offset = offset_for_row(row)
+            self.row_images.append((FRAME_ATLAS.frame(sprite_sheet, offset),
+                                    FRAME_ATLAS.frame(sprite_sheet, offset + SPRITE_SIZE)))
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    @property
+    def x(self):
+        """Left edge of every slot (dead ones included)"""
+        return self.offset_x + self.origin_x
+
+    @property
+    def y(self):
+        """Top edge of every slot (dead ones included)"""
+        return self.offset_y + self.origin_y
+
+    def alive_indices(self):
+        """Return the slot indices of all living aliens in grid order"""
+        return np.flatnonzero(self.alive)
+
+    def rect(self, index):
+        """Return the screen rect of the alien in the given slot"""
+        row, col = divmod(int(index), self.cols)
+        return pygame.Rect(int(self.origin_x) + col * self.spacing_x,
+                           int(self.origin_y) + row * self.spacing_y, SPRITE_SIZE, SPRITE_SIZE)
+
+    def bounds(self):
+        """Return (left, top, right, bottom) of the living aliens from the cached index"""
+        return (self.origin_x + self.left_column * self.spacing_x,
+                self.origin_y + self.top_row * self.spacing_y,
+                self.origin_x + self.right_column * self.spacing_x + SPRITE_SIZE,
+                self.origin_y + self.bottom_row * self.spacing_y + SPRITE_SIZE)
+
+    def at_edge(self, direction):
+        """Check whether any living alien touches the screen edge it is moving towards"""
+        if not self.count:
+            return False
+        left, _, right, _ = self.bounds()
+        return right >= SCREEN_WIDTH if direction == 1 else left <= 0
+
+    def move(self, dx, dy=0):
+        """Move the formation by (dx, dy), rounding to whole pixels like pygame.Rect"""
+        self.origin_x = _round_half_away(self.origin_x + dx)
+        self.origin_y += dy
+
+    def lowest_index(self):
+        """Return the slot of the lowest living alien (first in grid order on ties); O(cols)"""
+        first = self.bottom_row * self.cols
+        return first + int(np.argmax(self.alive[first:first + self.cols]))
+
+    def random_shooter(self, rng):
+        """Return the slot of the bottom alien in a random column that still has aliens"""
+        col = rng.choice(self.live_columns)
+        return self.column_bottom[col] * self.cols + col
+
+    def store_previous(self):
+        """Remember the current origin as the interpolation start for this tick"""
+        self.previous_origin = (self.origin_x, self.origin_y)
+
+    def bottom(self):
+        """Return the bottom edge of the lowest living alien"""
+        if not self.count:
+            return -np.inf
+        return self.bounds()[3]
+
+    def animate(self, elapsed, speed=ANIMATION_SPEED):
+        """Advance the shared animation clock and toggle every frame at once; True if it toggled"""
+        self.animation_timer += elapsed
+        if self.animation_timer > speed:
+            self.frame ^= 1
+            self.animation_timer = 0
+            return True
+        return False
+
+    def _remove(self, slot):
+        """Mark one living alien dead and update the column index and bounds"""
+        self.alive[slot] = False
+        self.count -= 1
+        row, col = divmod(slot, self.cols)
+        self.row_count[row] -= 1
+        self.column_count[col] -= 1
+        if self.column_count[col] == 0:
+            # Swap-remove the column from the live list
+            position = self.column_position[col]
+            last = self.live_columns.pop()
+            if last != col:
+                self.live_columns[position] = last
+                self.column_position[last] = position
+        elif row == self.column_bottom[col]:
+            alive = self.alive
+            while not alive[row * self.cols + col]:
+                row -= 1
+            self.column_bottom[col] = row
+
+        # Each pointer only ever moves inwards, so this is amortized O(1)
+        if self.count:
+            while not self.column_count[self.left_column]:
+                self.left_column += 1
+            while not self.column_count[self.right_column]:
+                self.right_column -= 1
+            while not self.row_count[self.top_row]:
+                self.top_row += 1
+            while not self.row_count[self.bottom_row]:
+                self.bottom_row -= 1
+
+    def load_alive(self, alive, live_columns):
+        """
+        Replace the living set (e.g. from a snapshot) and rebuild the column index
 
-# --- Alien Class ---
-class Alien(Drawable):
-    """Enemy alien with row-based sprite type"""
+        Args:
+            alive: Boolean array with one entry per slot
+            live_columns: Columns that still have aliens, in live_columns order
+                (random_shooter's picks depend on it)
+        """
+        self.alive[:] = alive
+        self.count = int(self.alive.sum())
+        grid = self.alive.reshape(self.rows, self.cols)
+        self.column_count = grid.sum(axis=0).tolist()
+        self.row_count = grid.sum(axis=1).tolist()
+        self.column_bottom = (self.rows - 1 - grid[::-1].argmax(axis=0)).tolist()
+        self.live_columns = list(live_columns)
+        for position, col in enumerate(self.live_columns):
+            self.column_position[col] = position
+        self.grid_slots = None
+        if self.count:
+            live_cols = np.flatnonzero(grid.any(axis=0))
+            live_rows = np.flatnonzero(grid.any(axis=1))
+            self.left_column, self.right_column = int(live_cols[0]), int(live_cols[-1])
+            self.top_row, self.bottom_row = int(live_rows[0]), int(live_rows[-1])
+
+    def kill(self, slots):
+        """Kill the aliens in the given slots"""
+        for slot in np.unique(np.asarray(slots, dtype=np.intp)).tolist():
+            if self.alive[slot]:
+                self._remove(slot)
+
+    def kill_colliding(self, rects):
+        """
+        Kill every living alien overlapping each rect, in order
 
-    def __init__(self, x, y, row, sprite_sheet):
-        # Determine alien type based on row
-        if row == 0:
-            offset = TOP_ALIEN_OFFSET
-        elif 1 <= row <= 2:
-            offset = MIDDLE_ALIEN_OFFSET
-        else:  # Rows 3 & 4
-            offset = TOP_ALIEN_OFFSET
+        Like pygame.sprite.groupcollide, an alien killed by an earlier rect can
+        no longer be hit by a later one. Up to BRUTE_FORCE_PAIRS rects are
+        resolved from the grid spacing directly; more go through the
+        collision grid in one vectorized pass.
 
-        super().__init__(sprite_sheet, offset, offset + SPRITE_SIZE)
-        self.rect.topleft = (x, y)
-        self.row = row
+        Args:
+            rects: Sequence of pygame.Rect
 
-    def update(self):
-        """Animate the alien sprite"""
-        self.animate()
+        Returns:
+            Indices into rects of those that hit at least one alien
+        """
+        if not self.count or not rects:
+            return []
+        if len(rects) <= BRUTE_FORCE_PAIRS:
+            return self._kill_in_cells(rects)
+        if self.grid_slots is None or self.count * 2 < len(self.grid_slots):
+            slots = self.alive_indices()
+            alien_boxes = np.full((len(slots), 4), SPRITE_SIZE, dtype=np.float64)
+            alien_boxes[:, 0] = self.offset_x[slots]
+            alien_boxes[:, 1] = self.offset_y[slots]
+            self.grid.build(alien_boxes)
+            self.grid_slots = slots
+
+        # Query in formation-local coordinates so the grid survives moves
+        local = rect_boxes(rects)
+        local[:, 0] -= self.origin_x
+        local[:, 1] -= self.origin_y
+        query_ids, items = self.grid.pairs(local)
+        hit_boxes = []
+        for box_id, slot in zip(query_ids.tolist(), self.grid_slots[items].tolist()):
+            if self.alive[slot]:
+                self._remove(slot)
+                if not hit_boxes or hit_boxes[-1] != box_id:
+                    hit_boxes.append(box_id)
+        return hit_boxes
+
+    def _kill_in_cells(self, rects):
+        """
+        kill_colliding for a few rects, without building any arrays
+
+        Slots sit on a regular lattice, so the columns and rows an alien
+        overlapping a rect can occupy follow from the spacing; only those
+        slots are visited, in ascending order like the grid's pairs.
+        """
+        origin_x = int(self.origin_x)
+        origin_y = int(self.origin_y)
+        alive = self.alive
+        cols = self.cols
+        hit_boxes = []
+        for box_id, rect in enumerate(rects):
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            # Slot c overlaps when left - SPRITE_SIZE < c * spacing < right (local coordinates)
+            first_col = max(0, (rect.left - origin_x - SPRITE_SIZE) // self.spacing_x + 1)
+            last_col = min(cols - 1, (rect.right - origin_x - 1) // self.spacing_x)
+            first_row = max(0, (rect.top - origin_y - SPRITE_SIZE) // self.spacing_y + 1)
+            last_row = min(self.rows - 1, (rect.bottom - origin_y - 1) // self.spacing_y)
+            hit = False
+            for row in range(first_row, last_row + 1):
+                for slot in range(row * cols + first_col, row * cols + last_col + 1):
+                    if alive[slot]:
+                        self._remove(slot)
+                        hit = True
+            if hit:
+                hit_boxes.append(box_id)
+        return hit_boxes
+
+    def draw(self, surface, alpha=1.0, rects=None):
+        """
+        Blit every living alien in grid order
+
+        Args:
+            surface: Target surface
+            alpha: Interpolation factor between the previous tick's positions (0) and
+                the current ones (1)
+            rects: Optional list that each alien's drawn rect is appended to
+
+        Returns:
+            The rect enclosing everything drawn
+        """
+        idx = self.alive_indices()
+        if not len(idx):
+            return pygame.Rect(0, 0, 0, 0)
+        offset_x = self.offset_x[idx]
+        offset_y = self.offset_y[idx]
+        x = offset_x + self.origin_x
+        y = offset_y + self.origin_y
+        if alpha < 1 and self.previous_origin is not None:
+            previous_x = offset_x + self.previous_origin[0]
+            previous_y = offset_y + self.previous_origin[1]
+            x = np.rint(previous_x + (x - previous_x) * alpha)
+            y = np.rint(previous_y + (y - previous_y) * alpha)
+        row_images = self.row_images
+        lefts, tops = x.tolist(), y.tolist()
+        surface.blits([
+            (row_images[row][frame], (left, top))
+            for row, frame, left, top in zip(self.row[idx].tolist(), self.frame[idx].tolist(),
+                                             lefts, tops)
+        ], doreturn=False)
+        if rects is not None:
+            rects.extend(pygame.Rect(left, top, SPRITE_SIZE, SPRITE_SIZE)
+                         for left, top in zip(lefts, tops))
+        left, top = int(x.min()), int(y.min())
+        return pygame.Rect(left, top, int(x.max()) + SPRITE_SIZE - left,
+                           int(y.max()) + SPRITE_SIZE - top)
 
 # --- Bunker Class ---
 class Bunker(pygame.sprite.Sprite):
-    """Defensive bunker that protects the player"""
+    """
+    Defensive bunker eroded pixel by pixel, as in the arcade original
+
+    Each bunker owns its image and a pygame.mask.Mask of its solid pixels.
+    A hit is found with Mask.overlap, which only scans where the bullet's
+    mask overlaps, and erodes a fixed-size crater from both the mask and the
+    image around the impact point. The cost of a hit therefore depends on
+    neither the bunker size nor how many hits came before.
+    """
 
-    MAX_HEALTH = 10
     WIDTH = 80
     HEIGHT = 40
+    CRATER_RADIUS = 4
+    _crater = None  # (mask, eraser surface), built on first use
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, shape=None):
+        """
+        Args:
+            x, y: Center position
+            shape: Intact bunker image, shared and never modified (see render_shape)
+        """
         super().__init__()
-        self.image = pygame.Surface((self.WIDTH, self.HEIGHT))
-        self.image.fill(GREEN)
+        self.shape = shape or Bunker.render_shape()
+        self.image = self.shape.copy()
+        self.mask = pygame.mask.from_surface(self.image)
         self.rect = self.image.get_rect(center=(x, y))
-        self.health = self.MAX_HEALTH
+        self.pixels = self.mask.count()  # solid pixels left
+        self.damaged = False
+        self.revision = 0  # bumped whenever the pixels change, so renderers know to redraw
+        self.impacts = []  # crater centers in bunker coordinates, oldest first
+        self.packed = (0, b"")  # (len(impacts), bits()) cache for snapshots
+
+    @classmethod
+    def render_shape(cls):
+        """Return the intact bunker image: a block with bevelled top corners and an arch"""
+        image = pygame.Surface((cls.WIDTH, cls.HEIGHT), pygame.SRCALPHA)
+        image.fill(GREEN)
+        clear = (0, 0, 0, 0)
+        bevel = cls.HEIGHT // 4
+        pygame.draw.polygon(image, clear, [(0, 0), (bevel, 0), (0, bevel)])
+        pygame.draw.polygon(image, clear, [(cls.WIDTH - 1, 0), (cls.WIDTH - 1 - bevel, 0),
+                                           (cls.WIDTH - 1, bevel)])
+        arch = pygame.Rect(0, 0, cls.WIDTH // 3, cls.HEIGHT // 2)
+        arch.midbottom = (cls.WIDTH // 2, cls.HEIGHT + arch.height // 2)
+        pygame.draw.ellipse(image, clear, arch)
+        return image
+
+    @classmethod
+    def crater(cls):
+        """
+        Return the shared (mask, eraser) for one crater
+
+        The crater is a disc with a ragged checkered rim. The eraser is
+        opaque white with transparent crater pixels, so blitting it with
+        BLEND_RGBA_MULT clears exactly the crater and leaves the rest.
+        """
+        if cls._crater is None:
+            radius = cls.CRATER_RADIUS
+            size = radius * 2 + 1
+            mask = pygame.mask.Mask((size, size))
+            eraser = pygame.Surface((size, size), pygame.SRCALPHA)
+            eraser.fill((255, 255, 255, 255))
+            for y in range(size):
+                for x in range(size):
+                    distance = math.hypot(x - radius, y - radius)
+                    if distance <= radius - 1 or (distance <= radius + 0.5 and (x + y) % 2 == 0):
+                        mask.set_at((x, y))
+                        eraser.set_at((x, y), (0, 0, 0, 0))
+            cls._crater = (mask, eraser)
+        return cls._crater
+
+    def hit(self, mask, offset):
+        """
+        Erode a crater where a mask touches this bunker's solid pixels
+
+        Args:
+            mask: The bullet's mask
+            offset: Position of the mask relative to this bunker's top-left
 
-    def take_damage(self):
-        """Reduce health and update visual appearance"""
-        self.health -= 1
-        if self.health <= 0:
+        Returns:
+            True if the mask touched a solid pixel
+        """
+        point = self.mask.overlap(mask, offset)
+        if point is None:
+            return False
+        self.erode(point)
+        return True
+
+    def erode(self, point):
+        """Remove a crater centered on point (bunker coordinates); dies when nothing is left"""
+        crater, eraser = self.crater()
+        topleft = (point[0] - self.CRATER_RADIUS, point[1] - self.CRATER_RADIUS)
+        self.pixels -= self.mask.overlap_area(crater, topleft)
+        self.mask.erase(crater, topleft)
+        self.image.blit(eraser, topleft, special_flags=pygame.BLEND_RGBA_MULT)
+        self.damaged = True
+        self.revision += 1
+        self.impacts.append(point)
+        if self.pixels <= 0:
             self.kill()
+
+    def bits(self):
+        """Return the solid pixels packed one bit each (column-major), cached until the next hit"""
+        count, bits = self.packed
+        if count != len(self.impacts) or not bits:
+            alpha = pygame.surfarray.pixels_alpha(self.image)
+            bits = np.packbits(alpha > 0).tobytes()
+            del alpha  # unlock the surface
+            self.packed = (len(self.impacts), bits)
+        return bits
+
+    def load_bits(self, bits=None):
+        """Replace the solid pixels with packed bits from bits(), or repair it if None"""
+        self.image.fill((0, 0, 0, 0))
+        self.image.blit(self.shape, (0, 0))
+        if bits is not None:
+            solid = np.unpackbits(np.frombuffer(bits, np.uint8), count=self.WIDTH * self.HEIGHT)
+            alpha = pygame.surfarray.pixels_alpha(self.image)
+            alpha[solid.reshape(alpha.shape) == 0] = 0
+            del alpha
+        self.mask = pygame.mask.from_surface(self.image)
+        self.pixels = self.mask.count()
+        self.damaged = bits is not None
+        self.revision += 1
+        self.impacts = []
+        self.packed = (0, bits if bits is not None else b"")
+
+
+# --- Object Pools ---
+class SpritePool:
+    """
+    Free list of reusable sprites
+
+    acquire() reuses an idle sprite through its reset() hook, or creates one
+    with the factory when none is idle. Pooled sprites return themselves on
+    kill(), after they have left every group. At most capacity idle sprites
+    are kept; extras are left to the garbage collector.
+    """
+
+    def __init__(self, factory, capacity=POOL_CAPACITY):
+        self.factory = factory
+        self.capacity = capacity
+        self.free = []
+        self.allocations = 0
+        self.reuses = 0
+        self.discards = 0
+        self.live = 0
+        self.high_water = 0
+
+    def acquire(self, *args):
+        """Return a sprite (not in any group) initialized with args"""
+        if self.free:
+            sprite = self.free.pop()
+            sprite.reset(*args)
+            self.reuses += 1
+        else:
+            sprite = self.factory(*args)
+            sprite.pool = self
+            self.allocations += 1
+        sprite.serial = self.allocations + self.reuses  # unique per acquisition, for spectators
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return sprite
+
+    def release(self, sprite):
+        """Take back a sprite that has been removed from all groups"""
+        self.live -= 1
+        if len(self.free) < self.capacity:
+            self.free.append(sprite)
         else:
-            # Gradually darken the green color as health decreases
-            green_value = 255 - (self.MAX_HEALTH - self.health) * 25
-            self.image.fill((0, green_value, 0))
+            self.discards += 1
+
+    def stats(self):
+        """Return allocation, reuse and occupancy counters"""
+        return {
+            "allocations": self.allocations,
+            "reuses": self.reuses,
+            "discards": self.discards,
+            "live": self.live,
+            "idle": len(self.free),
+            "high_water": self.high_water,
+        }
+
+
+class Pooled:
+    """Mixin for sprites that return to their SpritePool when killed"""
+
+    pool = None
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
 
 # --- UFO Class ---
-class UFO(pygame.sprite.Sprite):
+class UFO(Pooled, pygame.sprite.Sprite):
     """Bonus UFO that flies across the top of the screen"""
 
     WIDTH = 60
     HEIGHT = 25
 
-    def __init__(self):
+    def __init__(self, speed=UFO_SPEED):
         super().__init__()
         self.image = pygame.Surface((self.WIDTH, self.HEIGHT), pygame.SRCALPHA)
         pygame.draw.ellipse(self.image, MAGENTA, [0, 0, self.WIDTH, self.HEIGHT])
-        self.rect = self.image.get_rect(center=(-30, 30))
-        self.speed = UFO_SPEED
+        self.rect = self.image.get_rect()
+        self.speed = speed
+        self.reset()
+
+    def reset(self):
+        """Place the UFO at its entry point (also used when reused from a pool)"""
+        self.rect.center = (-30, 30)
+        self.previous_topleft = None
 
     def update(self):
         """Move UFO across the screen"""
@@ -180,13 +1619,21 @@ class UFO(pygame.sprite.Sprite):
             self.kill()
 
 # --- Bullet Class ---
-class Bullet(Drawable):
+class Bullet(Pooled, Drawable):
     """Player's bullet projectile"""
 
-    def __init__(self, x, y, sprite_sheet):
+    def __init__(self, x, y, sprite_sheet, speed=BULLET_SPEED):
         super().__init__(sprite_sheet, BEAM_OFFSET, BEAM_OFFSET + SPRITE_SIZE)
+        self.mask = FRAME_ATLAS.mask(sprite_sheet, BEAM_OFFSET)  # bullets never animate
+        self.speed = speed
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Place the bullet at (x, y) (also used when reused from a pool)"""
+        self.image_index = 0
+        self.image = self.images[0]
         self.rect.center = (x, y)
-        self.speed = BULLET_SPEED
+        self.previous_topleft = None
 
     def update(self):
         """Move bullet upward"""
@@ -195,13 +1642,21 @@ class Bullet(Drawable):
             self.kill()
 
 # --- Alien Bullet Class ---
-class AlienBullet(Drawable):
+class AlienBullet(Pooled, Drawable):
     """Alien's bullet projectile"""
 
-    def __init__(self, x, y, sprite_sheet):
+    def __init__(self, x, y, sprite_sheet, speed=ALIEN_BULLET_SPEED):
         super().__init__(sprite_sheet, BOMB_OFFSET, BOMB_OFFSET + SPRITE_SIZE)
+        self.mask = FRAME_ATLAS.mask(sprite_sheet, BOMB_OFFSET)
+        self.speed = speed
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Place the bullet at (x, y) (also used when reused from a pool)"""
+        self.image_index = 0
+        self.image = self.images[0]
         self.rect.center = (x, y)
-        self.speed = ALIEN_BULLET_SPEED
+        self.previous_topleft = None
 
     def update(self):
         """Move bullet downward"""
@@ -209,80 +1664,1000 @@ class AlienBullet(Drawable):
         if self.rect.top > SCREEN_HEIGHT:
             self.kill()
 
+# --- HUD Text Cache ---
+class GlyphStrip:
+    """Pre-rendered glyphs used to compose text without rasterizing the font"""
+
+    def __init__(self, font, characters="0123456789", color=WHITE, glyphs=None):
+        """
+        Args:
+            font: Font the glyphs are rendered with (unused when glyphs is given)
+            characters: Characters to pre-render
+            color: Glyph color
+            glyphs: Already rendered glyphs keyed by character, e.g. from an AssetPack
+        """
+        self.glyphs = glyphs or {char: font.render(char, True, color) for char in characters}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def render(self, text):
+        """Compose text from the glyph strip into a new surface"""
+        glyphs = [self.glyphs[char] for char in text]
+        surface = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.height),
+                                 pygame.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return surface
+
+
+class HudText:
+    """HUD line that re-renders its text surface only when the value changes"""
+
+    def __init__(self, font, label, color=WHITE, glyphs=None):
+        """
+        Args:
+            font: Font used for the label (and the value when glyphs is None)
+            label: Fixed text shown before the value
+            color: Text color
+            glyphs: Optional GlyphStrip used to build the value instead of the font
+        """
+        self.font = font
+        self.label = label
+        self.color = color
+        self.glyphs = glyphs
+        self.label_surface = font.render(label, True, color) if glyphs else None
+        self.value = None
+        self.surface = None
+        self.renders = 0
+        self.avoided = 0
+
+    def render(self, value):
+        """Return the surface for value, reusing the cached one if it is unchanged"""
+        if self.surface is not None and value == self.value:
+            self.avoided += 1
+            return self.surface
+
+        self.value = value
+        self.renders += 1
+        if self.glyphs is None:
+            self.surface = self.font.render(f"{self.label}{value}", True, self.color)
+        else:
+            digits = self.glyphs.render(str(value))
+            label_width = self.label_surface.get_width()
+            height = max(self.label_surface.get_height(), digits.get_height())
+            self.surface = pygame.Surface((label_width + digits.get_width(), height),
+                                          pygame.SRCALPHA)
+            self.surface.blit(self.label_surface, (0, 0))
+            self.surface.blit(digits, (label_width, 0))
+        return self.surface
+
+
+# --- Input Recording ---
+REPLAY_MAGIC = b"VCSR"
+REPLAY_VERSION = 2
+REPLAY_HEADER_V1 = struct.Struct("<4sBQI")  # magic, version, seed, tick count
+# Version 2 adds the formation rows/columns and the length of the GameConfig
+# overrides, which follow the header as UTF-8 JSON
+REPLAY_HEADER = struct.Struct("<4sBQIHHH")
+
+# Input byte layout: bits 0-1 direction + 1, bit 2 fire,
+# bit 3 a new integral frame time follows as a varint,
+# bit 4 a new fractional frame time follows as a float64
+INPUT_FIRE = 0x04
+INPUT_FRAME_TIME_INT = 0x08
+INPUT_FRAME_TIME_FLOAT = 0x10
+
+
+def _write_varint(buffer, value):
+    """Append an unsigned LEB128 varint"""
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data, pos):
+    """Read an unsigned LEB128 varint, returning (value, new position)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class InputRecorder:
+    """
+    Compact per-tick log of player input and frame time
+
+    Consecutive identical ticks are stored as one run (varint run length plus
+    one input byte); the frame time is only written when it changes. The
+    header records the seed, formation size and config overrides, everything
+    besides the input that the simulation depends on.
+    """
+
+    def __init__(self, seed, formation=(FORMATION_ROWS, FORMATION_COLS), config=None):
+        self.seed = seed
+        self.formation = tuple(formation)
+        self.config = config or GameConfig()
+        self.runs = []  # [count, direction, fire, frame_time]
+
+    @property
+    def ticks(self):
+        return sum(run[0] for run in self.runs)
+
+    def record(self, direction, fire, frame_time):
+        """Append one tick of input"""
+        if self.runs:
+            last = self.runs[-1]
+            if last[1] == direction and last[2] == fire and last[3] == frame_time:
+                last[0] += 1
+                return
+        self.runs.append([1, direction, fire, frame_time])
+
+    def to_bytes(self):
+        """Encode the log as a replay file"""
+        body = bytearray()
+        frame_time = None
+        for count, direction, fire, tick_ms in self.runs:
+            flags = (direction + 1) | (INPUT_FIRE if fire else 0)
+            if tick_ms != frame_time:
+                integral = float(tick_ms).is_integer() and tick_ms >= 0
+                flags |= INPUT_FRAME_TIME_INT if integral else INPUT_FRAME_TIME_FLOAT
+            _write_varint(body, count)
+            body.append(flags)
+            if flags & INPUT_FRAME_TIME_INT:
+                _write_varint(body, int(tick_ms))
+            elif flags & INPUT_FRAME_TIME_FLOAT:
+                body += struct.pack("<d", tick_ms)
+            frame_time = tick_ms
+        overrides = json.dumps(self.config.overrides(), sort_keys=True).encode("utf-8")
+        header = REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.ticks,
+                                    *self.formation, len(overrides))
+        return header + overrides + bytes(body)
+
+    def save(self, path):
+        """Write the replay file"""
+        Path(path).write_bytes(self.to_bytes())
+
+
+class Replay:
+    """
+    A decoded replay: the seed, formation and config plus one
+    (direction, fire, frame_time) entry per tick
+    """
+
+    def __init__(self, seed, runs, formation=(FORMATION_ROWS, FORMATION_COLS), config=None):
+        self.seed = seed
+        self.formation = tuple(formation)
+        self.config = config or GameConfig()
+        self.runs = runs
+        # Tick index at which each run starts, for seeking
+        self.run_starts = []
+        tick = 0
+        for run in runs:
+            self.run_starts.append(tick)
+            tick += run[0]
+        self.ticks = tick
+        self.cursor = (0, 0)  # (tick, run index) where the last play() stopped
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Decode a replay produced by InputRecorder.to_bytes
+
+        Version 1 files predate the formation and config fields and are
+        loaded with the defaults they were recorded with.
+        """
+        magic, version, seed, ticks = REPLAY_HEADER_V1.unpack_from(data)
+        if magic != REPLAY_MAGIC or version not in (1, REPLAY_VERSION):
+            raise ValueError("Not a VC-SpaceInvaders replay file")
+        formation = (FORMATION_ROWS, FORMATION_COLS)
+        config = GameConfig()
+        pos = REPLAY_HEADER_V1.size
+        if version >= 2:
+            *_, rows, cols, config_length = REPLAY_HEADER.unpack_from(data)
+            pos = REPLAY_HEADER.size + config_length
+            formation = (rows, cols)
+            try:
+                config = GameConfig(**json.loads(data[REPLAY_HEADER.size:pos].decode("utf-8")))
+            except (ValueError, TypeError) as error:
+                raise ValueError(f"Replay file has a bad config: {error}")
+        runs = []
+        frame_time = 0
+        while pos < len(data):
+            count, pos = _read_varint(data, pos)
+            flags = data[pos]
+            pos += 1
+            if flags & INPUT_FRAME_TIME_INT:
+                frame_time, pos = _read_varint(data, pos)
+            elif flags & INPUT_FRAME_TIME_FLOAT:
+                (frame_time,) = struct.unpack_from("<d", data, pos)
+                pos += 8
+            runs.append((count, (flags & 0x03) - 1, bool(flags & INPUT_FIRE), frame_time))
+        replay = cls(seed, runs, formation, config)
+        if replay.ticks != ticks:
+            raise ValueError("Replay file is truncated")
+        return replay
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay file"""
+        return cls.from_bytes(Path(path).read_bytes())
+
+    def play(self, game, start=0, stop=None):
+        """
+        Re-simulate ticks [start, stop) on game at uncapped speed
+
+        The game must already be at tick start of this replay (see seek).
+        Playback resumes from the run where the previous call stopped, so
+        stepping through a replay a tick at a time costs O(1) per tick; any
+        other start is found by bisection. Returns the number of ticks simulated.
+        """
+        stop = self.ticks if stop is None else min(stop, self.ticks)
+        tick = start
+        cursor_tick, index = self.cursor
+        if cursor_tick != start:
+            index = max(0, bisect.bisect_right(self.run_starts, start) - 1)
+        while tick < stop and index < len(self.runs):
+            count, direction, fire, frame_time = self.runs[index]
+            run_end = self.run_starts[index] + count
+            game.frame_time = frame_time
+            for _ in range(min(run_end, stop) - tick):
+                game.apply_input(direction, fire)
+                game.update()
+            tick = min(run_end, stop)
+            if tick == run_end:
+                index += 1
+        self.cursor = (tick, index)
+        return max(0, tick - start)
+
+    def check(self, game):
+        """Raise ValueError unless game has the formation and config this replay was recorded with"""
+        if tuple(game.formation) != self.formation:
+            raise ValueError(f"Replay was recorded with a {self.formation[0]}x{self.formation[1]} "
+                             f"formation, not {game.formation[0]}x{game.formation[1]}")
+        if game.config.as_dict() != self.config.as_dict():
+            raise ValueError(f"Replay was recorded with {self.config!r}, not {game.config!r}")
+
+    def seek(self, game, tick):
+        """Reset game to this replay's start and fast-forward it to the given tick"""
+        self.check(game)
+        game.reset(self.seed)
+        return self.play(game, 0, tick)
+
+
+# --- Frame Profiler ---
+PROFILE_PHASES = (
+    "events",
+    "update.player",
+    "update.bullets",
+    "update.ufo",
+    "update.aliens",
+    "update.alien_movement",
+    "update.alien_firing",
+    "update.collisions",
+    "update.spawn_ufo",
+    "update.particles",
+    "draw.clear",
+    "draw.sprites",
+    "draw.aliens",
+    "draw.particles",
+    "draw.ui",
+    "draw.present",
+    "sleep",
+    "frame",
+)
+PROFILE_CAPACITY = 3600  # frames kept in the ring buffer (one minute at 60 FPS)
+PROFILE_OVERLAY_REFRESH = 30  # frames between overlay percentile updates
+
+
+class FrameProfiler:
+    """
+    Per-phase frame timings in a fixed-size ring buffer
+
+    Call begin_frame() at the top of a frame and lap(phase) after each
+    phase; a lap is the time since the previous lap. end_frame() stores the
+    row, overwriting the oldest frame once the buffer is full.
+    """
+
+    def __init__(self, capacity=PROFILE_CAPACITY, phases=PROFILE_PHASES):
+        self.phases = phases
+        self.columns = {phase: i for i, phase in enumerate(phases)}
+        self.samples = np.zeros((capacity, len(phases)), dtype=np.float32)
+        self.row = np.zeros(len(phases), dtype=np.float64)
+        self.capacity = capacity
+        self.frames = 0  # total frames recorded, including overwritten ones
+        self.frame_start = self.last = time.perf_counter()
+
+    def begin_frame(self):
+        """Start timing a new frame"""
+        self.row[:] = 0
+        self.frame_start = self.last = time.perf_counter()
+
+    def lap(self, phase):
+        """Add the time since the previous lap to phase"""
+        now = time.perf_counter()
+        self.row[self.columns[phase]] += (now - self.last) * 1000
+        self.last = now
+
+    def end_frame(self):
+        """Store the current frame's timings in the ring buffer"""
+        self.row[self.columns["frame"]] = (time.perf_counter() - self.frame_start) * 1000
+        self.samples[self.frames % self.capacity] = self.row
+        self.frames += 1
+
+    def recent(self):
+        """Return the buffered frames in recording order (oldest first)"""
+        if self.frames <= self.capacity:
+            return self.samples[:self.frames]
+        start = self.frames % self.capacity
+        return np.concatenate((self.samples[start:], self.samples[:start]))
+
+    def summary(self):
+        """Return p50/p99/mean/max milliseconds per phase over the buffered frames"""
+        data = self.recent()
+        if not len(data):
+            return {}
+        totals = {
+            "update": data[:, [i for p, i in self.columns.items() if p.startswith("update.")]].sum(axis=1),
+            "draw": data[:, [i for p, i in self.columns.items() if p.startswith("draw.")]].sum(axis=1),
+        }
+        columns = {phase: data[:, i] for phase, i in self.columns.items()}
+        columns.update(totals)
+        return {
+            phase: {
+                "p50": float(np.percentile(values, 50)),
+                "p99": float(np.percentile(values, 99)),
+                "mean": float(values.mean()),
+                "max": float(values.max()),
+            }
+            for phase, values in columns.items()
+        }
+
+    def export(self, path):
+        """Write the buffered frames to CSV, or JSON with a summary if path ends in .json"""
+        path = Path(path)
+        data = self.recent()
+        if path.suffix.lower() == ".json":
+            payload = {
+                "phases": list(self.phases),
+                "frames_recorded": self.frames,
+                "summary": self.summary(),
+                "samples_ms": data.round(4).tolist(),
+            }
+            path.write_text(json.dumps(payload, indent=2))
+        else:
+            lines = [",".join(self.phases)]
+            lines.extend(",".join(f"{value:.4f}" for value in row) for row in data.tolist())
+            path.write_text("\n".join(lines) + "\n")
+
+
+# --- Input Latency ---
+LATENCY_BIN_MS = 0.5  # histogram bin width
+LATENCY_MAX_MS = 250  # inputs slower than this land in the last bin
+
+
+class LatencyTracker:
+    """
+    Input-to-present latency histograms
+
+    pygame does not expose SDL's event timestamps, so each input is stamped
+    when it is sampled. The time since the previous sample is kept as well,
+    because an event can have waited in the queue for up to that long. An
+    input is followed through the simulation tick that applies it to the
+    first present after that tick.
+    """
+
+    KINDS = ("fire", "move")
+
+    def __init__(self, bin_ms=LATENCY_BIN_MS, max_ms=LATENCY_MAX_MS):
+        self.bin_ms = bin_ms
+        bins = int(max_ms / bin_ms) + 1
+        self.histograms = {(kind, measure): np.zeros(bins, dtype=np.int64)
+                           for kind in self.KINDS for measure in ("sample", "worst")}
+        self.sampled = []  # (kind, sampled_at, queue wait bound) awaiting a simulation tick
+        self.applied = []  # the same, consumed by a tick and awaiting a present
+        self.last_poll = None
+        self.poll_gap = 0.0
+
+    def poll(self):
+        """Mark an input sampling point; returns its timestamp"""
+        now = time.perf_counter()
+        self.poll_gap = now - self.last_poll if self.last_poll is not None else 0.0
+        self.last_poll = now
+        return now
+
+    def input(self, kind):
+        """Record an input of kind ("fire" or "move") seen at the latest poll"""
+        self.sampled.append((kind, self.last_poll, self.poll_gap))
+
+    def tick(self):
+        """A simulation tick consumed every input sampled so far"""
+        if self.sampled:
+            self.applied.extend(self.sampled)
+            self.sampled.clear()
+
+    def presented(self):
+        """A frame was presented; record the latency of every applied input"""
+        if not self.applied:
+            return
+        now = time.perf_counter()
+        last = len(self.histograms["fire", "sample"]) - 1
+        for kind, sampled_at, wait in self.applied:
+            latency = (now - sampled_at) * 1000
+            for measure, value in (("sample", latency), ("worst", latency + wait * 1000)):
+                self.histograms[kind, measure][min(int(value / self.bin_ms), last)] += 1
+        self.applied.clear()
+
+    def summary(self):
+        """Return count and p50/p95/p99/max milliseconds per input kind and measure"""
+        result = {}
+        for (kind, measure), counts in self.histograms.items():
+            total = int(counts.sum())
+            if not total:
+                continue
+            cumulative = np.cumsum(counts)
+            upper_edges = (np.arange(len(counts)) + 1) * self.bin_ms
+
+            def percentile(q):
+                return float(upper_edges[np.searchsorted(cumulative, q * total)])
+
+            result[f"{kind}.{measure}"] = {
+                "count": total,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": float(upper_edges[np.flatnonzero(counts)[-1]]),
+            }
+        return result
+
+    def export(self, path):
+        """Write the histograms and summary to a JSON file"""
+        payload = {
+            "bin_ms": self.bin_ms,
+            "summary": self.summary(),
+            "histograms": {f"{kind}.{measure}": counts.tolist()
+                           for (kind, measure), counts in self.histograms.items()},
+        }
+        Path(path).write_text(json.dumps(payload, indent=2))
+
+
+# --- Memory Tracking ---
+MEMORY_CAPACITY = 4096  # wave samples kept in the ring buffer
+MEMORY_SLOPE_POINTS = 512  # samples used for a growth estimate (pairs grow quadratically)
+MEMORY_FIELDS = (
+    "wave",
+    "aliens",
+    "bullets",
+    "alien_bullets",
+    "ufos",
+    "bunkers",
+    "craters",
+    "particles",
+    "pooled",
+    "surfaces",
+    "surface_bytes",
+    "traced_bytes",
+    "traced_delta",
+    "rss_bytes",
+)
+
+
+def surface_bytes(surface):
+    """Return the pixel memory of a Surface, row padding included"""
+    return surface.get_pitch() * surface.get_height()
+
+
+def process_rss():
+    """Return the process's resident set size in bytes (0 where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+class MemoryTracker:
+    """
+    Per-wave memory samples in a fixed-size ring buffer
+
+    sample(game) records the live entity counts, the pixel bytes of every
+    Surface the game holds, the Python heap traced by tracemalloc (and its
+    change since the previous sample) and the process RSS. Rows go into a
+    preallocated array, so the tracker itself does not grow the traced heap
+    as waves go by. mark() and top_growth() name the allocation sites that
+    grew between two points.
+
+    With collect, a full garbage collection runs before every sample so the
+    traced heap counts only reachable objects; otherwise cyclic garbage
+    (e.g. left over from imports) is freed at an arbitrary later wave and
+    shows up as a step. It costs a frame hitch per wave, so the interactive
+    game leaves it off.
+    """
+
+    def __init__(self, capacity=MEMORY_CAPACITY, log=True, collect=False):
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        self.columns = {field: i for i, field in enumerate(MEMORY_FIELDS)}
+        self.samples = np.zeros((capacity, len(MEMORY_FIELDS)), dtype=np.int64)
+        self.capacity = capacity
+        self.count = 0  # total samples taken, including overwritten ones
+        self.log = log
+        self.collect = collect
+        self.baseline = None  # tracemalloc snapshot taken by mark()
+
+    def sample(self, game):
+        """Record one row for the game's current state; returns it as a dict"""
+        if self.collect:
+            gc.collect()
+        traced = tracemalloc.get_traced_memory()[0]
+        previous = self.samples[(self.count - 1) % self.capacity, self.columns["traced_bytes"]]
+        surfaces = game.owned_surfaces()
+        values = {
+            "wave": game.wave_number,
+            **game.entity_counts(),
+            "surfaces": len(surfaces),
+            "surface_bytes": sum(surface_bytes(surface) for surface in surfaces),
+            "traced_bytes": traced,
+            "traced_delta": traced - previous if self.count else 0,
+            "rss_bytes": process_rss(),
+        }
+        self.samples[self.count % self.capacity] = [values[field] for field in MEMORY_FIELDS]
+        self.count += 1
+        if self.log:
+            print(f"memory wave {values['wave']}: {values['aliens']} aliens, "
+                  f"{values['bullets'] + values['alien_bullets']} bullets, "
+                  f"{values['pooled']} pooled, {values['surfaces']} surfaces "
+                  f"({values['surface_bytes'] / 1024:.0f} KiB), "
+                  f"traced {traced / 1024:.0f} KiB ({values['traced_delta'] / 1024:+.1f} KiB), "
+                  f"rss {values['rss_bytes'] / 2 ** 20:.1f} MiB")
+        return values
+
+    def recent(self):
+        """Return the buffered samples in recording order (oldest first)"""
+        if self.count <= self.capacity:
+            return self.samples[:self.count]
+        start = self.count % self.capacity
+        return np.concatenate((self.samples[start:], self.samples[:start]))
+
+    def slope(self, field, start=0):
+        """
+        Return the growth of field per sample over the buffered samples from start on
+
+        This is the Theil-Sen estimate (median slope over all sample pairs), so
+        one-off steps such as a cache filling or the allocator trimming its
+        free lists do not hide, or fake, a steady leak the way they would skew
+        a least-squares fit. Long runs are thinned to MEMORY_SLOPE_POINTS.
+        """
+        values = self.recent()[start:, self.columns[field]].astype(np.float64)
+        positions = np.arange(len(values))
+        if len(values) > MEMORY_SLOPE_POINTS:
+            positions = np.linspace(0, len(values) - 1, MEMORY_SLOPE_POINTS).astype(np.intp)
+            values = values[positions]
+        if len(values) < 2:
+            return 0.0
+        first, second = np.triu_indices(len(values), 1)
+        return float(np.median((values[second] - values[first]) / (positions[second] - positions[first])))
+
+    def mark(self):
+        """Take the tracemalloc snapshot that top_growth() compares against"""
+        self.baseline = self._traces()
+
+    def top_growth(self, limit=10):
+        """
+        Return the allocation sites that grew most since mark()
+
+        Returns:
+            List of ("file:line", bytes grown, blocks grown), largest first
+        """
+        if self.baseline is None:
+            return []
+        stats = self._traces().compare_to(self.baseline, "lineno")
+        return [(str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+                for stat in stats[:limit] if stat.size_diff > 0]
+
+    @staticmethod
+    def _traces():
+        """Snapshot the traced heap, leaving out tracemalloc's own bookkeeping"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+    def export(self, path):
+        """Write the buffered samples to CSV, or JSON with growth slopes if path ends in .json"""
+        path = Path(path)
+        data = self.recent()
+        if path.suffix.lower() == ".json":
+            payload = {
+                "fields": list(MEMORY_FIELDS),
+                "samples_recorded": self.count,
+                "slopes": {field: self.slope(field) for field in MEMORY_FIELDS if field != "wave"},
+                "samples": data.tolist(),
+            }
+            path.write_text(json.dumps(payload, indent=2))
+        else:
+            lines = [",".join(MEMORY_FIELDS)]
+            lines.extend(",".join(str(value) for value in row) for row in data.tolist())
+            path.write_text("\n".join(lines) + "\n")
+
+    def close(self):
+        """Stop tracemalloc if this tracker started it"""
+        if self.started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.baseline = None
+
+
+# --- State Snapshots ---
+SNAPSHOT_CAPACITY = 600  # snapshots kept by a SnapshotRing (ten seconds at one per tick)
+# score, wave, lives, player x/y, player direction, alien direction, fire pressed, running,
+# fire timer, UFO timer, formation origin x/y, animation timer, gauss_next (NaN if unset),
+# animation frame, UFO present, UFO x/y, live columns, bunkers, bullets, alien bullets
+SNAPSHOT_HEADER = struct.Struct("<qIhhhbb??ddddddB?hhHBHH")
+SNAPSHOT_RNG = struct.Struct("<625I")  # Mersenne Twister state words plus position
+SNAPSHOT_POINT = struct.Struct("<hh")
+BUNKER_BITS_SIZE = (Bunker.WIDTH * Bunker.HEIGHT + 7) // 8
+SNAPSHOT_BUNKER = struct.Struct("<hh?")  # center x/y, damaged (packed pixel bits follow if so)
+
+
+class TrackedRandom(random.Random):
+    """
+    random.Random that counts state changes
+
+    Snapshots compare the counter to skip packing and restoring the 2.5 KB
+    generator state when no numbers were drawn since the last one. Both
+    random() and getrandbits() are overridden, so the sequence is the same
+    as random.Random's for the same seed.
+    """
+
+    version = 0
+
+    def seed(self, *args, **kwargs):
+        super().seed(*args, **kwargs)
+        self.version += 1
+
+    def setstate(self, state):
+        super().setstate(state)
+        self.version += 1
+
+    def random(self):
+        self.version += 1
+        return super().random()
+
+    def getrandbits(self, k):
+        self.version += 1
+        return super().getrandbits(k)
+
+
+class SnapshotRing:
+    """
+    Fixed-size ring of recent Game snapshots for rewind and rollback
+
+    push() stores Game.snapshot() in the next slot, overwriting the oldest
+    once the ring is full. rewind() restores an older snapshot and drops
+    every newer one, so the game can be re-simulated from there. Save and
+    restore times and snapshot sizes are accumulated for stats().
+    """
+
+    def __init__(self, capacity=SNAPSHOT_CAPACITY):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.pushed = 0  # snapshots ever pushed, minus rewound ones
+        self.held = 0  # snapshots currently in the ring
+        self.saves = 0
+        self.restores = 0
+        self.save_seconds = 0.0
+        self.restore_seconds = 0.0
+        self.total_bytes = 0
+        self.last_bytes = 0
+
+    def __len__(self):
+        return self.held
+
+    def push(self, game):
+        """Snapshot the game into the ring"""
+        start = time.perf_counter()
+        data = game.snapshot()
+        self.save_seconds += time.perf_counter() - start
+        self.saves += 1
+        self.total_bytes += len(data)
+        self.last_bytes = len(data)
+        self.slots[self.pushed % self.capacity] = data
+        self.pushed += 1
+        self.held = min(self.held + 1, self.capacity)
+
+    def get(self, back=0):
+        """Return the snapshot back pushes before the newest (0 is the newest)"""
+        if not 0 <= back < self.held:
+            raise IndexError(f"only {self.held} snapshots in the ring")
+        return self.slots[(self.pushed - 1 - back) % self.capacity]
+
+    def rewind(self, game, back=0):
+        """Restore the snapshot back pushes before the newest and forget every newer one"""
+        data = self.get(back)
+        start = time.perf_counter()
+        game.restore(data)
+        self.restore_seconds += time.perf_counter() - start
+        self.restores += 1
+        self.pushed -= back
+        self.held -= back
+
+    def stats(self):
+        """Return snapshot sizes, ring memory and mean save/restore microseconds"""
+        held_bytes = sum(len(self.get(back)) for back in range(self.held))
+        return {
+            "snapshots": self.held,
+            "last_bytes": self.last_bytes,
+            "mean_bytes": self.total_bytes / self.saves if self.saves else 0,
+            "ring_bytes": held_bytes,
+            "saves": self.saves,
+            "restores": self.restores,
+            "save_us": self.save_seconds / self.saves * 1e6 if self.saves else 0.0,
+            "restore_us": self.restore_seconds / self.restores * 1e6 if self.restores else 0.0,
+        }
+
+
+# --- Gameplay Configuration ---
+class GameConfig:
+    """
+    Gameplay tunables for one game, defaulting to the module constants
+
+    Every Game reads its balance from its own config, so games with
+    different settings can run side by side in one process (see sweep.py).
+    """
+
+    DEFAULTS = {
+        "player_speed": PLAYER_SPEED,
+        "player_lives": PLAYER_LIVES,
+        "bullet_speed": BULLET_SPEED,
+        "alien_bullet_speed": ALIEN_BULLET_SPEED,
+        "ufo_speed": UFO_SPEED,
+        "alien_move_down": ALIEN_MOVE_DOWN_AMOUNT,
+        "alien_fire_interval": ALIEN_FIRE_INTERVAL,
+        "ufo_spawn_interval": UFO_SPAWN_INTERVAL,
+        "animation_speed": ANIMATION_SPEED,
+        "alien_speedup_per_kill": ALIEN_SPEEDUP_PER_KILL,
+        "wave_speed_bonus": WAVE_SPEED_BONUS,
+        "alien_score": ALIEN_SCORE,
+        "ufo_score": UFO_SCORE,
+    }
+
+    def __init__(self, **values):
+        unknown = values.keys() - self.DEFAULTS.keys()
+        if unknown:
+            raise TypeError(f"Unknown game config fields: {', '.join(sorted(unknown))}")
+        for name, default in self.DEFAULTS.items():
+            setattr(self, name, values.get(name, default))
+
+    def as_dict(self):
+        """Return every field as a plain dict"""
+        return {name: getattr(self, name) for name in self.DEFAULTS}
+
+    def replace(self, **values):
+        """Return a copy with some fields changed"""
+        return GameConfig(**{**self.as_dict(), **values})
+
+    def overrides(self):
+        """Return only the fields that differ from the defaults"""
+        return {name: value for name, value in self.as_dict().items()
+                if value != self.DEFAULTS[name]}
+
+    def __repr__(self):
+        changed = self.overrides()
+        return f"GameConfig({', '.join(f'{name}={value!r}' for name, value in changed.items())})"
+
+
 # --- Main Game Class ---
 class Game:
     """Main game controller that manages game state and logic"""
 
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("VC-SpaceInvaders")
+    def __init__(self, headless=False, dirty_rects=False, glyph_hud=False, seed=None,
+                 profile=False, profile_overlay=False, render_fps=FPS,
+                 pool_capacity=POOL_CAPACITY, asset_pack=ASSET_PACK_PATH,
+                 score_db=SCORES_PATH, formation=(FORMATION_ROWS, FORMATION_COLS),
+                 latency=False, late_latch=False, config=None, window_size=None,
+                 integer_scale=True, particles=None, audio_frequency=MIXER_FREQUENCY,
+                 audio_buffer=MIXER_BUFFER, memory=False):
+        """
+        Initialize the game
+
+        Args:
+            headless: Skip the display window, music and score persistence and render
+                to an offscreen surface
+            dirty_rects: Erase and present only the areas that changed instead of
+                clearing and flipping the whole screen every frame
+            glyph_hud: Build the score digits from a pre-rendered glyph strip
+            seed: Seed for the game's random number generator (random if None)
+            profile: Time every frame phase into a FrameProfiler ring buffer
+            profile_overlay: Show p50/p99 frame times on screen (implies profile)
+            render_fps: Render rate cap for run() (0 for uncapped); the simulation
+                always ticks at FPS
+            pool_capacity: Idle sprites kept by each bullet/UFO object pool
+            asset_pack: Baked asset pack to map instead of decoding strip.png
+                (None, or a missing file, falls back to the PNG)
+            score_db: SQLite leaderboard file (None disables persistence)
+            formation: (rows, columns) of the alien grid; thousands of aliens are fine
+            latency: Record input-to-present latency histograms in a LatencyTracker
+            late_latch: In run(), sleep before sampling input and sample it right
+                before every simulation tick instead of once at the top of the frame
+            config: GameConfig with the gameplay tunables (defaults if None)
+            window_size: (width, height) of the window; when it differs from the
+                logical SCREEN_WIDTH x SCREEN_HEIGHT the scene is drawn into a
+                logical-size framebuffer and scaled once per frame (headless
+                games scale into an offscreen window surface)
+            integer_scale: Scale the framebuffer by a whole factor and letterbox,
+                instead of stretching it to fit the window
+            particles: Show explosion and debris particles, with their count and
+                cost in the HUD (default: on unless headless)
+            audio_frequency: Mixer sample rate in Hz
+            audio_buffer: Mixer buffer size in samples; trades effect latency against CPU
+            memory: Sample entity counts, Surface bytes and traced heap into a
+                MemoryTracker at the start of every wave, and log them
+        """
+        self.startup_started = time.perf_counter()
+        self.config = config or GameConfig()
+        self.first_frame_ms = None  # milliseconds from construction to the first presented frame
+        self.headless = headless
+        self.dirty_rects = dirty_rects
+        self.drawn_rects = None  # moving sprites' rects drawn last frame (dirty-rect mode only)
+        self.static_drawn = {}  # layer -> {bunker or HUD line: (token, rect) as last drawn}
+        self.full_flips = 0
+        self.dirty_updates = 0
+        # Only the subsystems the game uses; the mixer starts with the music later
+        pygame.font.init()
+        logical_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.window_size = tuple(window_size) if window_size else logical_size
+        scaled = self.window_size != logical_size
+        if headless:
+            self.window = pygame.Surface(self.window_size) if scaled else None
+            self.screen = pygame.Surface(logical_size)
+        else:
+            pygame.display.init()
+            self.window = pygame.display.set_mode(self.window_size)
+            pygame.display.set_caption("VC-SpaceInvaders")
+            # The framebuffer matches the window's pixel format so scaling needs no conversion
+            self.screen = pygame.Surface(logical_size).convert() if scaled else self.window
+        self.scaler = FramebufferScaler(self.screen, self.window, integer_scale) if scaled else None
         self.clock = pygame.time.Clock()
+        self.frame_time = 0  # milliseconds elapsed during the previous frame
         self.running = True
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = TrackedRandom(self.seed)
+        self.rng_snapshot = (None, b"")  # (rng version, packed state) of the last snapshot or restore
+        if particles is None:
+            particles = not headless
+        self.particles = ParticleSystem(seed=self.seed) if particles else None
+        self.fire_pressed = False  # fire input for the current tick
+        self.render_fps = render_fps
+        self.input_direction = 0  # latest sampled movement input
+        self.pending_fire = False  # fire pressed since the last simulation tick
+        self.recorder = None  # InputRecorder while recording
+        self.profiler = FrameProfiler() if profile or profile_overlay else None
+        self.profile_overlay = profile_overlay
+        self.latency = LatencyTracker() if latency else None
+        self.late_latch = late_latch
+        self.spectator = None  # SpectatorServer fed after every tick (see spectator.py)
+        self.sounds = None if headless else SoundEffects(audio_frequency, audio_buffer)
+        self.memory = MemoryTracker() if memory else None
+
+        # Map the baked pack if there is one, else decode the sprite sheet
+        self.assets = AssetManager()
+        self.pack = self.assets.pack(asset_pack) if asset_pack else None
+        if self.pack is not None:
+            self.sprite_sheet = self.pack
+            self.bunker_shape = self.pack.bunker_shape() or Bunker.render_shape()
+        else:
+            self.sprite_sheet = self.assets.image(SPRITE_SHEET_PATH)
+            self.bunker_shape = Bunker.render_shape()
 
-        # Load sprite sheet
-        self.sprite_sheet = pygame.image.load(SPRITE_SHEET_PATH).convert_alpha()
-
-        # Initialize game objects
-        self.player = Player(self.sprite_sheet)
+        # Sprite groups
         self.bullets = pygame.sprite.Group()
-        self.aliens = pygame.sprite.Group()
+        self.aliens = None  # AlienFormation, created per wave
         self.alien_bullets = pygame.sprite.Group()
         self.bunkers = pygame.sprite.Group()
+        self.bunker_slots = []  # every bunker ever created, repaired and reused each wave
         self.ufo = pygame.sprite.GroupSingle()
 
+        # Object pools for short-lived sprites
+        sheet = self.sprite_sheet
+        config = self.config
+        self.bullet_pool = SpritePool(lambda x, y: Bullet(x, y, sheet, config.bullet_speed),
+                                      pool_capacity)
+        self.alien_bullet_pool = SpritePool(
+            lambda x, y: AlienBullet(x, y, sheet, config.alien_bullet_speed), pool_capacity)
+        self.ufo_pool = SpritePool(lambda: UFO(config.ufo_speed), pool_capacity)
+
+        # Collision broad phase (bunkers are static, bullets are rebuilt every tick)
+        self.bunker_grid = CollisionGrid()
+        self.bunker_list = []  # bunkers indexed by bunker_grid
+        self.bunker_rects = []  # their rects, for the small-set path
+        self.bullet_grid = CollisionGrid()
+        self.alien_bullet_grid = CollisionGrid()
+
+        self.scores = ScoreStore(score_db) if score_db and not headless else None
+        self.run_id = None  # leaderboard key of the current game
+        self.formation = formation
+
+        # UI
+        self.font = pygame.font.Font(None, HUD_FONT_SIZE)
+        score_glyphs = None
+        if glyph_hud:
+            baked = self.pack.glyphs() if self.pack is not None else None
+            score_glyphs = GlyphStrip(self.font, glyphs=baked)
+        self.hud_lives = HudText(self.font, "Lives: ")
+        self.hud_score = HudText(self.font, "Score: ", glyphs=score_glyphs)
+        self.hud_wave = HudText(self.font, "Wave: ")
+        self.hud_highscore = HudText(self.font, "Highscore: ", glyphs=score_glyphs)
+        self.overlay_font = pygame.font.Font(None, 22)
+        self.hud_profile = HudText(self.overlay_font, "", color=GREEN)
+        self.hud_particles = HudText(self.overlay_font, "", color=GREEN)
+        self.particle_text = ""
+        self.particle_frames = 0  # frames drawn, for refreshing the particle HUD line
+        self.profile_text = ""
+        self.profile_refreshed_at = None  # profiler frame count at the last overlay refresh
+
+        # Initialize game objects and state
+        self.reset(self.seed)
+
+    def reset(self, seed=None):
+        """
+        Start a new game from wave 1, reseeding the random number generator
+
+        Args:
+            seed: Seed for the new game; if None a fresh one is drawn from the
+                current generator, so consecutive games differ but a seeded
+                session stays reproducible
+        """
+        self.seed = seed if seed is not None else self.rng.getrandbits(32)
+        self.rng.seed(self.seed)
+        self.run_id = uuid.uuid4().hex
+        self.player = Player(self.sprite_sheet, self.config.player_speed, self.config.player_lives)
+        # Kill rather than empty() so pooled sprites go back to their pools
+        for group in (self.bullets, self.alien_bullets, self.ufo):
+            for sprite in group.sprites():
+                sprite.kill()
+        if self.particles is not None:
+            self.particles.clear()
+
         # Game state
         self.alien_direction = 1  # 1 for right, -1 for left
         self.alien_fire_timer = 0
         self.ufo_spawn_timer = 0
         self.score = 0
         self.wave_number = 1
-        self.highscore = self.load_highscore()
-
-        # UI
-        self.font = pygame.font.Font(None, 36)
+        self.running = True
 
         # Initialize game elements
         self._create_alien_grid()
         self._create_bunkers()
+        if self.memory is not None:
+            self.memory.sample(self)
 
-        # Load and play music
-        pygame.mixer.music.load(MUSIC_PATH)
-        pygame.mixer.music.play(-1)
-
-    def load_highscore(self):
-        """Load high score from file, return 0 if file doesn't exist"""
-        try:
-            with open(HIGHSCORE_FILE, "r") as f:
-                return int(f.read())
-        except (IOError, ValueError):
-            return 0
+    @property
+    def highscore(self):
+        """Best leaderboard score, read from the in-memory cache"""
+        return self.scores.highscore if self.scores is not None else 0
 
-    def save_highscore(self):
-        """Save high score to file if current score is higher"""
-        if self.score > self.highscore:
-            with open(HIGHSCORE_FILE, "w") as f:
-                f.write(str(self.score))
+    def record_score(self):
+        """Checkpoint the current score to the leaderboard without blocking"""
+        if self.scores is not None and self.score > 0:
+            self.scores.submit(self.run_id, self.score, self.wave_number)
 
     def _create_alien_grid(self):
-        """Create a grid of aliens"""
-        self.aliens.empty()
-        rows = 5
-        cols = 11
-        spacing_x = 40
-        spacing_y = 40
-        offset_x = 60
-        offset_y = 50
-
-        for row in range(rows):
-            for col in range(cols):
-                x = col * spacing_x + offset_x
-                y = row * spacing_y + offset_y
-                alien = Alien(x, y, row, self.sprite_sheet)
-                self.aliens.add(alien)
+        """Create the alien formation, tightening the spacing so large grids fit on screen"""
+        rows, cols = self.formation
+        spacing_x = max(1, min(40, (SCREEN_WIDTH - 120) // cols))
+        spacing_y = max(1, min(40, (SCREEN_HEIGHT // 2 - 50) // rows))
+        self.aliens = AlienFormation(self.sprite_sheet, rows, cols, spacing_x, spacing_y)
 
     def _create_bunkers(self):
-        """Create defensive bunkers"""
+        """Place the defensive bunkers, repairing last wave's instead of allocating new ones"""
         self.bunkers.empty()
         bunker_count = 4
         bunker_spacing = 200
@@ -290,25 +2665,159 @@ class Game:
 
         for i in range(bunker_count):
             x = 100 + i * bunker_spacing
-            bunker = Bunker(x, bunker_y)
+            if i < len(self.bunker_slots):
+                bunker = self.bunker_slots[i]
+                bunker.rect.center = (x, bunker_y)
+                if bunker.damaged:
+                    bunker.load_bits()
+            else:
+                bunker = Bunker(x, bunker_y, self.bunker_shape)
+                self.bunker_slots.append(bunker)
             self.bunkers.add(bunker)
+        self._rebuild_bunker_grid()
+
+    def _rebuild_bunker_grid(self):
+        """Index the surviving bunkers for collision queries"""
+        self.bunker_list = self.bunkers.sprites()
+        self.bunker_rects = [bunker.rect for bunker in self.bunker_list]
+        self.bunker_grid.build(rect_boxes(self.bunker_rects))
 
-    def run(self):
-        """Main game loop"""
+    def run(self, record_path=None, profile_path=None, latency_path=None, memory_path=None):
+        """
+        Main game loop
+
+        The simulation advances in fixed SIM_TICK_MS steps driven by an
+        accumulator of real elapsed time, independent of the render rate.
+        Rendering interpolates between the last two simulation ticks. At
+        most MAX_CATCH_UP_TICKS ticks run per frame; time beyond that is
+        dropped so a slow machine slows the game down instead of spiralling.
+
+        With late_latch the frame sleeps first and input is sampled right
+        before each tick, so it is as fresh as possible when simulated.
+        """
+        profiler = self.profiler
+        latency = self.latency
+        late_latch = self.late_latch
+        self.draw()
+        self.first_frame_shown()
+        accumulator = 0.0
+        self.clock.tick()
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            if profiler:
+                profiler.begin_frame()
+            if late_latch:
+                self.clock.tick(self.render_fps)
+                if profiler:
+                    profiler.lap("sleep")
+            accumulator += self.clock.get_time()
+            if not late_latch:
+                self.handle_events()
+                if profiler:
+                    profiler.lap("events")
+
+            ticks = 0
+            while accumulator >= SIM_TICK_MS and self.running:
+                if ticks == MAX_CATCH_UP_TICKS:
+                    accumulator = 0.0
+                    break
+                if late_latch:
+                    self.handle_events()
+                    if profiler:
+                        profiler.lap("events")
+                self.step()
+                accumulator -= SIM_TICK_MS
+                ticks += 1
+
+            self.draw(alpha=accumulator / SIM_TICK_MS)
+            if latency:
+                latency.presented()
+            if not late_latch:
+                self.clock.tick(self.render_fps)
+                if profiler:
+                    profiler.lap("sleep")
+            if profiler:
+                profiler.end_frame()
 
         # Cleanup on exit
-        pygame.mixer.music.stop()
-        self.save_highscore()
+        self.assets.stop_music()
+        self.record_score()
+        if self.scores is not None:
+            self.scores.close()
+        if self.recorder is not None and record_path:
+            self.recorder.save(record_path)
+        if profiler and profile_path:
+            profiler.export(profile_path)
+        if profiler and self.sounds is not None and self.sounds.ready:
+            print(self.sounds.describe())
+        if self.spectator is not None:
+            self.spectator.close()
+            print(self.spectator.describe())
+        if latency:
+            for name, stats in latency.summary().items():
+                print(f"latency {name}: {stats['count']} inputs, p50 {stats['p50']:.1f} ms, "
+                      f"p95 {stats['p95']:.1f} ms, p99 {stats['p99']:.1f} ms, max {stats['max']:.1f} ms")
+            if latency_path:
+                latency.export(latency_path)
+        if self.memory is not None:
+            if memory_path:
+                self.memory.export(memory_path)
+            self.memory.close()
         pygame.quit()
         sys.exit()
 
+    def first_frame_shown(self):
+        """
+        Record time-to-first-frame and start loading the music
+
+        Returns:
+            Milliseconds from Game construction to this call
+        """
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (time.perf_counter() - self.startup_started) * 1000
+            if not self.headless:
+                print(f"time to first frame: {self.first_frame_ms:.1f} ms")
+                print(describe_assets(self.asset_stats()))
+                self.assets.start_music(MUSIC_PATH, sounds=self.sounds)
+        return self.first_frame_ms
+
+    def step(self):
+        """Run one fixed simulation tick using the latest sampled input"""
+        self._store_previous_positions()
+        self.frame_time = SIM_TICK_MS
+        self.apply_input(self.input_direction, self.pending_fire)
+        self.pending_fire = False
+        if self.latency:
+            self.latency.tick()
+        self.update()
+        if self.spectator is not None:
+            self.spectator.broadcast(self)
+
+    def _store_previous_positions(self):
+        """Remember where everything was before this tick, for render interpolation"""
+        for sprite in (self.player, *self.bullets, *self.alien_bullets, *self.ufo):
+            sprite.previous_topleft = sprite.rect.topleft
+        self.aliens.store_previous()
+
+    def watch_replay(self, replay, start=0):
+        """Play the rest of a replay in the window at normal speed"""
+        tick = start
+        while self.running and tick < replay.ticks:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN
+                                                 and event.key == pygame.K_ESCAPE):
+                    self.running = False
+            tick += replay.play(self, tick, tick + 1)
+            self.draw()
+            self.first_frame_shown()
+            self.clock.tick(FPS)
+        self.assets.stop_music()
+        pygame.quit()
+
     def handle_events(self):
         """Handle user input and events"""
+        if self.latency:
+            self.latency.poll()
+        fire = False
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
@@ -316,38 +2825,268 @@ class Game:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
                 elif event.key == pygame.K_SPACE:
-                    self.player.shoot(self.bullets, self.sprite_sheet)
+                    fire = True
+
+        # Input is latched here and consumed by the next simulation tick
+        keys = pygame.key.get_pressed()
+        direction = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+        if self.latency:
+            if fire:
+                self.latency.input("fire")
+            if direction != self.input_direction:
+                self.latency.input("move")
+        self.input_direction = direction
+        self.pending_fire = self.pending_fire or fire
+
+    def apply_input(self, direction, fire):
+        """
+        Apply one tick of player input
+
+        Args:
+            direction: -1 left, 0 idle, 1 right
+            fire: Whether fire was pressed this tick
+        """
+        self.player.direction = direction
+        self.fire_pressed = fire
+        if fire:
+            self.player.shoot(self.bullets, self.bullet_pool, self.sounds)
+
+    def start_recording(self):
+        """Start logging input from the beginning of a fresh game"""
+        self.reset()
+        self.recorder = InputRecorder(self.seed, self.formation, self.config)
+
+    def simulate(self, steps, tick_ms=SIM_TICK_MS):
+        """
+        Advance the game logic by a number of fixed simulated ticks without rendering
+
+        Args:
+            steps: Maximum number of ticks to run
+            tick_ms: Simulated frame time fed to the timers for each tick
+
+        Returns:
+            Number of ticks actually run (fewer than steps if the game ended)
+        """
+        self.frame_time = tick_ms
+        profiler = self.profiler
+        for step in range(steps):
+            if not self.running:
+                return step
+            if profiler:
+                profiler.begin_frame()
+            self.update()
+            if profiler:
+                profiler.end_frame()
+        return steps
+
+    def snapshot(self):
+        """
+        Capture the full simulation state between ticks as compact bytes
+
+        Only plain numbers are stored (no Surfaces or sprite objects), so a
+        snapshot is a few KB, most of it the random generator's state. The
+        layout is SNAPSHOT_HEADER, the generator state, the formation's
+        alive bits and live columns, then bunkers, bullets and alien bullets.
+        Input sampling, pools and render interpolation are not included.
+        """
+        player = self.player
+        aliens = self.aliens
+        ufo = self.ufo.sprite
+        rng = self.rng
+        version, rng_state = self.rng_snapshot
+        if version != rng.version:
+            rng_state = SNAPSHOT_RNG.pack(*rng.getstate()[1])
+            self.rng_snapshot = (rng.version, rng_state)
+        gauss_next = rng.gauss_next if rng.gauss_next is not None else math.nan
+        bunkers = self.bunkers.sprites()
+        live_columns = aliens.live_columns
+        header = SNAPSHOT_HEADER.pack(
+            self.score, self.wave_number, player.lives, *player.rect.topleft, player.direction,
+            self.alien_direction, self.fire_pressed, self.running, self.alien_fire_timer,
+            self.ufo_spawn_timer, aliens.origin_x, aliens.origin_y, aliens.animation_timer,
+            gauss_next, int(aliens.frame[0]) if aliens.size else 0, ufo is not None,
+            *(ufo.rect.topleft if ufo is not None else (0, 0)), len(live_columns),
+            len(bunkers), len(self.bullets), len(self.alien_bullets))
+        point = SNAPSHOT_POINT.pack
+        return b"".join((
+            header,
+            rng_state,
+            np.packbits(aliens.alive).tobytes(),
+            struct.pack(f"<{len(live_columns)}H", *live_columns),
+            self._pack_bunkers(bunkers),
+            b"".join(point(*bullet.rect.center) for bullet in self.bullets),
+            b"".join(point(*bomb.rect.center) for bomb in self.alien_bullets),
+        ))
+
+    @staticmethod
+    def _pack_bunkers(bunkers):
+        """Encode bunker positions and, for damaged ones, their pixels for a snapshot"""
+        return b"".join(SNAPSHOT_BUNKER.pack(*bunker.rect.center, bunker.damaged)
+                        + (bunker.bits() if bunker.damaged else b"") for bunker in bunkers)
+
+    def restore(self, data):
+        """
+        Return the simulation to a state captured by snapshot()
+
+        The game must have been created with the same formation size.
+        Sprites are reused or drawn from their pools, so restoring allocates
+        no Surfaces in the steady state.
+        """
+        (score, wave, lives, player_x, player_y, player_direction, alien_direction, fire_pressed,
+         running, fire_timer, ufo_timer, origin_x, origin_y, animation_timer, gauss_next, frame,
+         has_ufo, ufo_x, ufo_y, column_count, bunker_count, bullet_count,
+         bomb_count) = SNAPSHOT_HEADER.unpack_from(data)
+        pos = SNAPSHOT_HEADER.size
+
+        rng = self.rng
+        rng_state = data[pos:pos + SNAPSHOT_RNG.size]
+        pos += SNAPSHOT_RNG.size
+        version, current_state = self.rng_snapshot
+        if version != rng.version or rng_state != current_state:
+            rng.setstate((3, SNAPSHOT_RNG.unpack(rng_state), None))
+            self.rng_snapshot = (rng.version, rng_state)
+        rng.gauss_next = None if math.isnan(gauss_next) else gauss_next
+
+        self.score = score
+        self.wave_number = wave
+        self.alien_direction = alien_direction
+        self.fire_pressed = fire_pressed
+        self.running = running
+        self.alien_fire_timer = fire_timer
+        self.ufo_spawn_timer = ufo_timer
+
+        player = self.player
+        player.lives = lives
+        player.rect.topleft = (player_x, player_y)
+        player.direction = player_direction
+        player.previous_topleft = None
+
+        # Rebuilding the formation index and the bunker grid dominates the cost, so
+        # both are skipped when nothing changed (e.g. rollback over a few ticks)
+        aliens = self.aliens
+        alive_bytes = (aliens.size + 7) // 8
+        packed = np.frombuffer(data, np.uint8, alive_bytes, pos)
+        pos += alive_bytes
+        live_columns = struct.unpack_from(f"<{column_count}H", data, pos)
+        pos += 2 * column_count
+        if (tuple(aliens.live_columns) != live_columns
+                or not np.array_equal(np.packbits(aliens.alive), packed)):
+            aliens.load_alive(np.unpackbits(packed, count=aliens.size).view(bool), live_columns)
+        aliens.origin_x = origin_x
+        aliens.origin_y = origin_y
+        aliens.animation_timer = animation_timer
+        aliens.frame[:] = frame
+        aliens.previous_origin = None
+
+        # Destroyed bunkers are recreated, e.g. when a rewind crosses a wave boundary
+        bunkers = self.bunkers.sprites()
+        bunker_start = pos
+        saved = []
+        for _ in range(bunker_count):
+            x, y, damaged = SNAPSHOT_BUNKER.unpack_from(data, pos)
+            pos += SNAPSHOT_BUNKER.size
+            bits = None
+            if damaged:
+                bits = data[pos:pos + BUNKER_BITS_SIZE]
+                pos += BUNKER_BITS_SIZE
+            saved.append((x, y, bits))
+        if data[bunker_start:pos] != self._pack_bunkers(bunkers):
+            self.bunkers.empty()
+            spare = [bunker for bunker in self.bunker_slots if bunker not in bunkers]
+            for i, (x, y, bits) in enumerate(saved):
+                if i < len(bunkers):
+                    bunker = bunkers[i]
+                elif spare:
+                    bunker = spare.pop(0)
+                else:
+                    bunker = Bunker(x, y, self.bunker_shape)
+                    self.bunker_slots.append(bunker)
+                bunker.rect.center = (x, y)
+                if bits is not None or bunker.damaged:
+                    bunker.load_bits(bits)
+                self.bunkers.add(bunker)
+            self._rebuild_bunker_grid()
+
+        for group, pool, count in ((self.bullets, self.bullet_pool, bullet_count),
+                                   (self.alien_bullets, self.alien_bullet_pool, bomb_count)):
+            for sprite in group.sprites():
+                sprite.kill()
+            for _ in range(count):
+                group.add(pool.acquire(*SNAPSHOT_POINT.unpack_from(data, pos)))
+                pos += SNAPSHOT_POINT.size
+
+        ufo = self.ufo.sprite
+        if not has_ufo:
+            if ufo is not None:
+                ufo.kill()
+        else:
+            if ufo is None:
+                ufo = self.ufo_pool.acquire()
+                self.ufo.add(ufo)
+            ufo.rect.topleft = (ufo_x, ufo_y)
+            ufo.previous_topleft = None
+
+        if self.spectator is not None:
+            self.spectator.encoder.previous = None  # deltas cannot express a rollback
 
     def update(self):
         """Update all game entities and logic"""
+        profiler = self.profiler
+        if self.recorder is not None:
+            self.recorder.record(self.player.direction, self.fire_pressed, self.frame_time)
+        self.fire_pressed = False
+
         self.player.update()
+        if profiler:
+            profiler.lap("update.player")
         self.bullets.update()
         self.alien_bullets.update()
+        if profiler:
+            profiler.lap("update.bullets")
         self.ufo.update()
-        self.aliens.update()  # Update alien animations
+        sounds = self.sounds
+        if sounds is not None and not self.ufo:
+            sounds.stop("ufo")
+        if profiler:
+            profiler.lap("update.ufo")
+        # Update alien animations; the march beats with every frame change
+        if self.aliens.animate(self.frame_time, self.config.animation_speed) and sounds is not None:
+            sounds.march()
+        if profiler:
+            profiler.lap("update.aliens")
         self._update_alien_movement()
+        if profiler:
+            profiler.lap("update.alien_movement")
         self._update_alien_firing()
+        if profiler:
+            profiler.lap("update.alien_firing")
         self._check_collisions()
+        if profiler:
+            profiler.lap("update.collisions")
         self._spawn_ufo()
+        if profiler:
+            profiler.lap("update.spawn_ufo")
+        if self.particles is not None:
+            self.particles.update(self.frame_time)
+            if profiler:
+                profiler.lap("update.particles")
 
     def _spawn_ufo(self):
         """Spawn UFO periodically if none exists"""
-        self.ufo_spawn_timer += self.clock.get_time()
-        if self.ufo_spawn_timer > UFO_SPAWN_INTERVAL and not self.ufo.sprite:
-            self.ufo.add(UFO())
+        self.ufo_spawn_timer += self.frame_time
+        if self.ufo_spawn_timer > self.config.ufo_spawn_interval and not self.ufo.sprite:
+            self.ufo.add(self.ufo_pool.acquire())
             self.ufo_spawn_timer = 0
+            if self.sounds is not None:
+                self.sounds.play("ufo", loops=-1)
 
     def _update_alien_firing(self):
         """Handle alien bullet firing logic"""
-        self.alien_fire_timer += self.clock.get_time()
-        if self.alien_fire_timer > ALIEN_FIRE_INTERVAL:
-            if self.aliens.sprites():
-                random_alien = random.choice(self.aliens.sprites())
-                alien_bullet = AlienBullet(
-                    random_alien.rect.centerx,
-                    random_alien.rect.bottom,
-                    self.sprite_sheet
-                )
+        self.alien_fire_timer += self.frame_time
+        if self.alien_fire_timer > self.config.alien_fire_interval:
+            if self.aliens:
+                shooter = self.aliens.rect(self.aliens.random_shooter(self.rng))
+                alien_bullet = self.alien_bullet_pool.acquire(shooter.centerx, shooter.bottom)
                 self.alien_bullets.add(alien_bullet)
             self.alien_fire_timer = 0
 
@@ -357,101 +3096,588 @@ class Game:
             return
 
         # Check if any alien hit the edge
-        move_down = False
-        for alien in self.aliens.sprites():
-            if (self.alien_direction == 1 and alien.rect.right >= SCREEN_WIDTH) or \
-               (self.alien_direction == -1 and alien.rect.left <= 0):
-                self.alien_direction *= -1
-                move_down = True
-                break
+        move_down = self.aliens.at_edge(self.alien_direction)
+        if move_down:
+            self.alien_direction *= -1
 
         # Calculate speed based on remaining aliens and wave number
-        aliens_remaining = len(self.aliens)
-        speed_multiplier = 1 + (55 - aliens_remaining) * 0.02
-        wave_speed_bonus = self.wave_number * 0.2
+        aliens_killed = self.aliens.size - len(self.aliens)
+        config = self.config
+        speedup = config.alien_speedup_per_kill * (CLASSIC_FORMATION_SIZE / self.aliens.size)
+        speed_multiplier = 1 + aliens_killed * speedup
+        wave_speed_bonus = self.wave_number * config.wave_speed_bonus
         alien_speed = (wave_speed_bonus + speed_multiplier) * self.alien_direction
 
         # Move all aliens
-        for alien in self.aliens.sprites():
-            alien.rect.x += alien_speed
-            if move_down:
-                alien.rect.y += ALIEN_MOVE_DOWN_AMOUNT
+        self.aliens.move(alien_speed, config.alien_move_down if move_down else 0)
 
-            # Check for game over condition
-            if alien.rect.bottom >= SCREEN_HEIGHT:
-                self.running = False
+        # Check for game over condition
+        if self.aliens.bottom() >= SCREEN_HEIGHT:
+            self.running = False
 
     def _check_collisions(self):
         """Check and handle all collision detection"""
+        particles = self.particles
+        sounds = self.sounds
         # Player bullets hitting aliens
-        if pygame.sprite.groupcollide(self.bullets, self.aliens, True, True):
-            self.score += ALIEN_SCORE
+        bullets = self.bullets.sprites()
+        if bullets:
+            hit_bullets = self.aliens.kill_colliding([bullet.rect for bullet in bullets])
+            for index in hit_bullets:
+                bullets[index].kill()
+                if particles is not None:
+                    particles.emit(*bullets[index].rect.midtop, 24, WHITE)
+            if hit_bullets:
+                self.score += self.config.alien_score
+                if sounds is not None:
+                    sounds.play("explosion")
 
         # Check for wave completion
         if not self.aliens:
             self.wave_number += 1
             self._create_alien_grid()
             self._create_bunkers()
+            self.record_score()
+            if self.memory is not None:
+                self.memory.sample(self)
 
         # Alien bullets hitting player
-        if pygame.sprite.spritecollide(self.player, self.alien_bullets, True):
-            self.player.lose_life()
-            if self.player.lives <= 0:
-                self.running = False
+        alien_bullets = self.alien_bullets.sprites()
+        if alien_bullets:
+            rects = [bullet.rect for bullet in alien_bullets]
+            if len(rects) <= BRUTE_FORCE_PAIRS:
+                hits = self.player.rect.collidelistall(rects)
+            else:
+                self.alien_bullet_grid.build(rect_boxes(rects))
+                hits = self.alien_bullet_grid.pairs(rect_boxes([self.player.rect]))[1].tolist()
+            if hits:
+                for index in hits:
+                    alien_bullets[index].kill()
+                if particles is not None:
+                    particles.emit(*self.player.rect.center, 64, WHITE, speed=4.0, life=900.0)
+                if sounds is not None:
+                    sounds.play("player_death")
+                self.player.lose_life()
+                self.record_score()
+                if self.player.lives <= 0:
+                    self.running = False
 
         # Bullets hitting bunkers (both player and alien)
         self._check_bunker_collisions(self.bullets)
         self._check_bunker_collisions(self.alien_bullets)
 
-        # Player bullets hitting UFO
-        if pygame.sprite.groupcollide(self.bullets, self.ufo, True, True):
-            self.score += UFO_SCORE
+        # Player bullets hitting UFO (only the first bullet in group order scores)
+        ufo = self.ufo.sprite
+        if ufo and self.bullets:
+            bullets = self.bullets.sprites()
+            rects = [bullet.rect for bullet in bullets]
+            if len(rects) <= BRUTE_FORCE_PAIRS:
+                hit = ufo.rect.collidelist(rects)
+            else:
+                self.bullet_grid.build(rect_boxes(rects))
+                hits = self.bullet_grid.pairs(rect_boxes([ufo.rect]))[1]
+                hit = int(hits[0]) if len(hits) else -1
+            if hit >= 0:
+                bullets[hit].kill()
+                ufo.kill()
+                if particles is not None:
+                    particles.emit(*ufo.rect.center, 48, MAGENTA, speed=4.0)
+                if sounds is not None:
+                    sounds.stop("ufo")
+                    sounds.play("ufo_hit")
+                self.score += self.config.ufo_score
 
     def _check_bunker_collisions(self, bullet_group):
-        """Check if bullets hit bunkers and apply damage"""
-        for bullet in bullet_group:
-            hits = pygame.sprite.spritecollide(bullet, self.bunkers, False)
-            if hits:
+        """Check if bullets hit solid bunker pixels and erode a crater where they do"""
+        bullets = bullet_group.sprites()
+        if not bullets or not self.bunker_list:
+            return
+        rects = [bullet.rect for bullet in bullets]
+        if len(rects) * len(self.bunker_list) <= BRUTE_FORCE_PAIRS:
+            pairs = rect_pairs(rects, self.bunker_rects)
+        else:
+            bullet_ids, bunker_ids = self.bunker_grid.pairs(rect_boxes(rects))
+            pairs = zip(bullet_ids.tolist(), bunker_ids.tolist())
+        destroyed = False
+        for bullet_id, bunker_id in pairs:
+            bunker = self.bunker_list[bunker_id]
+            bullet = bullets[bullet_id]
+            if not bunker.alive() or not bullet.alive():
+                continue
+            # Pixel test over the overlapping area only; a near miss keeps flying
+            offset = (bullet.rect.x - bunker.rect.x, bullet.rect.y - bunker.rect.y)
+            if bunker.hit(bullet.mask, offset):
                 bullet.kill()
-                for bunker in hits:
-                    bunker.take_damage()
+                if self.particles is not None:
+                    impact = bunker.impacts[-1]
+                    self.particles.emit(bunker.rect.x + impact[0], bunker.rect.y + impact[1], 8, GREEN,
+                                        speed=1.5, life=300.0)
+                destroyed = destroyed or not bunker.alive()
+        if destroyed:
+            self._rebuild_bunker_grid()
+
+    def draw(self, alpha=1.0):
+        """
+        Render all game elements to the screen
 
-    def draw(self):
-        """Render all game elements to the screen"""
-        self.screen.fill(BLACK)
+        Args:
+            alpha: Interpolation factor between the previous simulation tick (0)
+                and the current one (1)
+        """
+        profiler = self.profiler
+        previous = self.drawn_rects
+        if previous is None:
+            self.screen.fill(BLACK)
+        else:
+            # Erase only the moving sprites drawn last frame; fill() keeps the
+            # full width of a rect hanging off the left edge, so clip first
+            bounds = self.screen.get_rect()
+            for rect in previous:
+                self.screen.fill(BLACK, rect.clip(bounds))
+        if profiler:
+            profiler.lap("draw.clear")
+
+        # Bunkers and HUD text sit under the sprites and are redrawn only when they change
+        changed = self._draw_static(
+            [(bunker, bunker.revision, bunker.image, bunker.rect) for bunker in self.bunkers],
+            previous, "bunkers")
+        if profiler:
+            profiler.lap("draw.sprites")
+        changed += self._draw_static(self._hud_items(), previous, "hud")
+        if profiler:
+            profiler.lap("draw.ui")
 
         # Draw all sprites
-        self.screen.blit(self.player.image, self.player.rect)
-        self.bullets.draw(self.screen)
-        self.alien_bullets.draw(self.screen)
-        self.aliens.draw(self.screen)
-        self.bunkers.draw(self.screen)
-        self.ufo.draw(self.screen)
+        drawn = [self.screen.blit(self.player.image, interpolated_rect(self.player, alpha))]
+        for group in (self.bullets, self.alien_bullets):
+            self._draw_group(group, alpha, drawn)
+        if profiler:
+            profiler.lap("draw.sprites")
+        self.aliens.draw(self.screen, alpha, drawn)
+        if profiler:
+            profiler.lap("draw.aliens")
+        self._draw_group(self.ufo, alpha, drawn)
+        if profiler:
+            profiler.lap("draw.sprites")
+        if self.particles is not None:
+            drawn.append(self.particles.draw(self.screen))
+            if profiler:
+                profiler.lap("draw.particles")
+
+        self._present(previous, drawn, changed)
+        if profiler:
+            profiler.lap("draw.present")
+
+    def _draw_static(self, items, erased, layer):
+        """
+        Draw items that stay on screen between frames in dirty-rect mode
 
-        # Draw UI elements
-        self._draw_ui()
+        An item is redrawn in full, and its old and new rects reported, only
+        when its token changed (a bunker's revision, a HUD line's rendered
+        surface) or it moved; otherwise only the parts that erasing last
+        frame's sprites cut out of it are repainted. Items that disappeared
+        are erased.
 
-        pygame.display.flip()
+        Args:
+            items: (key, token, image, rect) per item
+            erased: Rects erased this frame, or None if the screen was cleared
+            layer: Name of the item set, so bunkers and HUD lines are tracked apart
 
-    def _draw_ui(self):
-        """Render UI elements (score, lives, wave, highscore)"""
-        # Lives (top-left)
-        lives_text = self.font.render(f"Lives: {self.player.lives}", True, WHITE)
-        self.screen.blit(lives_text, (10, 10))
+        Returns:
+            Rects whose pixels changed, beyond the erased ones
+        """
+        screen = self.screen
+        drawn = self.static_drawn.setdefault(layer, {})
+        current = {}
+        changed = []
+        for key, token, image, rect in items:
+            current[key] = (token, rect.copy())
+            last = drawn.get(key)
+            if erased is None:
+                screen.blit(image, rect)
+            elif last is None or last[0] != token or last[1] != rect:
+                if last is not None:
+                    screen.fill(BLACK, last[1])
+                    changed.append(last[1])
+                screen.blit(image, rect)
+                changed.append(rect.copy())
+            else:
+                for hole in erased:
+                    clip = rect.clip(hole)
+                    if clip:
+                        # Holes can overlap; clear first so translucent pixels don't build up
+                        screen.fill(BLACK, clip)
+                        screen.blit(image, clip, clip.move(-rect.x, -rect.y))
+        if erased is not None:
+            for key, (_, rect) in drawn.items():
+                if key not in current:
+                    screen.fill(BLACK, rect)
+                    changed.append(rect)
+        self.static_drawn[layer] = current
+        return changed
+
+    def _hud_items(self):
+        """Render the HUD lines (cached while unchanged) as (key, token, image, rect) items"""
+        lives = self.hud_lives.render(self.player.lives)
+        score = self.hud_score.render(self.score)
+        wave = self.hud_wave.render(self.wave_number)
+        highscore = self.hud_highscore.render(self.highscore)
+        lines = [
+            (self.hud_lives, lives, (10, 10)),  # top-left
+            (self.hud_score, score, (SCREEN_WIDTH - score.get_width() - 10, 10)),  # top-right
+            (self.hud_wave, wave, (SCREEN_WIDTH // 2 - wave.get_width() // 2, 10)),  # top-center
+            (self.hud_highscore, highscore,  # below score
+             (SCREEN_WIDTH - highscore.get_width() - 10, 40)),
+        ]
+        if self.particles is not None:
+            lines.append(self._particle_stats_line())
+        if self.profile_overlay:
+            lines.append(self._profile_overlay_line())
+        return [(line, image, image, image.get_rect(topleft=topleft)) for line, image, topleft in lines]
+
+    def _profile_overlay_line(self):
+        """Return the p50/p99 frame, update and draw times line for the bottom-left corner"""
+        profiler = self.profiler
+        refreshed_at = self.profile_refreshed_at
+        if refreshed_at is None or profiler.frames - refreshed_at >= PROFILE_OVERLAY_REFRESH:
+            summary = profiler.summary()
+            if summary:
+                self.profile_refreshed_at = profiler.frames
+                self.profile_text = "  ".join(
+                    f"{phase} p50 {summary[phase]['p50']:.2f} p99 {summary[phase]['p99']:.2f} ms"
+                    for phase in ("frame", "update", "draw"))
+        text = self.hud_profile.render(self.profile_text)
+        return self.hud_profile, text, (10, SCREEN_HEIGHT - text.get_height() - 5)
+
+    def _particle_stats_line(self):
+        """Return the live particle count and update + draw cost line for the bottom-right corner"""
+        particles = self.particles
+        if self.particle_frames % PROFILE_OVERLAY_REFRESH == 0:
+            self.particle_text = (f"particles {len(particles)}  "
+                                  f"{particles.update_ms + particles.draw_ms:.2f} ms")
+        self.particle_frames += 1
+        text = self.hud_particles.render(self.particle_text)
+        return (self.hud_particles, text,
+                (SCREEN_WIDTH - text.get_width() - 10, SCREEN_HEIGHT - text.get_height() - 5))
+
+    def _draw_group(self, group, alpha, drawn):
+        """Blit a sprite group at interpolated positions and collect the drawn rects"""
+        if alpha >= 1:
+            group.draw(self.screen)
+            drawn.extend(sprite.rect.copy() for sprite in group)
+            return
+        rects = [interpolated_rect(sprite, alpha) for sprite in group]
+        self.screen.blits(zip((sprite.image for sprite in group), rects), doreturn=False)
+        drawn.extend(rect.copy() for rect in rects)
 
-        # Score (top-right)
-        score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (SCREEN_WIDTH - score_text.get_width() - 10, 10))
+    def _present(self, previous, drawn, changed=()):
+        """
+        Show the frame, updating only dirty areas when that is cheaper than a flip
 
-        # Wave (top-center)
-        wave_text = self.font.render(f"Wave: {self.wave_number}", True, WHITE)
-        self.screen.blit(wave_text, (SCREEN_WIDTH // 2 - wave_text.get_width() // 2, 10))
+        The dirty areas are last frame's sprites (erased), this frame's
+        sprites and whatever bunkers or HUD lines changed. With a
+        FramebufferScaler the logical frame is scaled into the window first;
+        dirty areas are scaled on their own when the factor is whole.
+        """
+        scaler = self.scaler
+        if self.dirty_rects:
+            self.drawn_rects = drawn
+            dirty = drawn if previous is None else previous + drawn + changed
+            dirty_area = sum(rect.width * rect.height for rect in dirty)
+            if (previous is not None and dirty_area <= DIRTY_AREA_LIMIT * SCREEN_WIDTH * SCREEN_HEIGHT
+                    and (scaler is None or scaler.factor)):
+                self.dirty_updates += 1
+                if scaler is not None:
+                    dirty = scaler.present_rects(dirty)
+                if not self.headless:
+                    pygame.display.update(dirty)
+                return
+
+        self.full_flips += 1
+        if scaler is not None:
+            scaler.present()
+        if not self.headless:
+            pygame.display.flip()
+
+    def pool_stats(self):
+        """Return allocation and reuse counters for each object pool"""
+        return {
+            "bullet": self.bullet_pool.stats(),
+            "alien_bullet": self.alien_bullet_pool.stats(),
+            "ufo": self.ufo_pool.stats(),
+        }
+
+    def entity_counts(self):
+        """Return how many of each kind of game object is alive, plus idle pooled sprites"""
+        return {
+            "aliens": len(self.aliens),
+            "bullets": len(self.bullets),
+            "alien_bullets": len(self.alien_bullets),
+            "ufos": len(self.ufo),
+            "bunkers": len(self.bunkers),
+            "craters": sum(len(bunker.impacts) for bunker in self.bunkers),
+            "particles": len(self.particles) if self.particles is not None else 0,
+            "pooled": sum(len(pool.free) for pool in (self.bullet_pool, self.alien_bullet_pool,
+                                                      self.ufo_pool)),
+        }
+
+    def owned_surfaces(self):
+        """Return every distinct Surface the game holds pixels in (subsurfaces excluded)"""
+        surfaces = [self.screen, self.window, self.bunker_shape, *FRAME_ATLAS.frames.values()]
+        surfaces.extend(bunker.image for bunker in self.bunker_slots)
+        surfaces.extend(ufo.image for ufo in (*self.ufo_pool.free, *self.ufo))
+        for line in (self.hud_lives, self.hud_score, self.hud_wave, self.hud_highscore,
+                     self.hud_profile, self.hud_particles):
+            surfaces.extend((line.surface, line.label_surface))
+            if line.glyphs is not None:
+                surfaces.extend(line.glyphs.glyphs.values())
+        if self.particles is not None:
+            surfaces.extend(square for levels in self.particles.sprites for square in levels)
+        if Bunker._crater is not None:
+            surfaces.append(Bunker._crater[1])
+        unique = {id(surface): surface for surface in surfaces
+                  if surface is not None and surface.get_parent() is None}
+        return list(unique.values())
+
+    def asset_stats(self):
+        """Return milliseconds spent loading each asset and the bytes of the mapped pack, if any"""
+        return {
+            "load_ms": {Path(path).name: ms for path, ms in self.assets.load_ms.items()},
+            "pack_bytes": self.pack.memory_bytes() if self.pack is not None else None,
+        }
+
+    def hud_stats(self):
+        """Return how many HUD text renders were performed and avoided"""
+        lines = (self.hud_lives, self.hud_score, self.hud_wave, self.hud_highscore)
+        return {
+            "renders": sum(line.renders for line in lines),
+            "avoided": sum(line.avoided for line in lines),
+        }
+
+# --- Headless Benchmark ---
+def describe_assets(stats):
+    """One-line summary of Game.asset_stats()"""
+    loads = ", ".join(f"{name} {ms:.1f} ms" for name, ms in stats["load_ms"].items())
+    mapped = f", {stats['pack_bytes']} bytes mapped" if stats["pack_bytes"] is not None else ""
+    return f"assets: {loads or 'all cached'}{mapped}"
+
+
+def autopilot(game):
+    """Simple bot for unattended runs: chase the lowest alien and fire constantly"""
+    player = game.player
+    if game.aliens:
+        target = game.aliens.rect(game.aliens.lowest_index())
+        offset = target.centerx - player.rect.centerx
+        direction = (offset > player.speed) - (offset < -player.speed)
+    else:
+        direction = 0
+    game.apply_input(direction, True)
+
+
+def run_headless_benchmark(steps, tick_ms=SIM_TICK_MS, formation=(FORMATION_ROWS, FORMATION_COLS),
+                           snapshots=False):
+    """
+    Run the simulation headlessly for a number of ticks and report throughput
+
+    A new game is started whenever the previous one ends, so long runs soak-test
+    many waves. Returns a dict with steps, elapsed seconds, steps/s, games, waves,
+    the time to the first rendered frame and the asset load times. With
+    snapshots, every tick is also pushed to a SnapshotRing and restored from
+    it, and the ring's stats are included.
+    """
+    game = Game(headless=True, formation=formation)
+    ring = SnapshotRing() if snapshots else None
+    game.draw()
+    first_frame_ms = game.first_frame_shown()
+    games = 1
+    waves = 0
+    done = 0
+    start = time.perf_counter()
+    while done < steps:
+        if not game.running:
+            waves += game.wave_number
+            game.reset()
+            games += 1
+        autopilot(game)
+        done += game.simulate(1, tick_ms)
+        if ring is not None:
+            ring.push(game)
+            ring.rewind(game)
+    elapsed = time.perf_counter() - start
+    waves += game.wave_number
+    return {
+        "steps": done,
+        "seconds": elapsed,
+        "steps_per_second": done / elapsed if elapsed > 0 else float("inf"),
+        "games": games,
+        "waves": waves,
+        "first_frame_ms": first_frame_ms,
+        "assets": game.asset_stats(),
+        "atlas": FRAME_ATLAS.stats(),
+        "pools": game.pool_stats(),
+        "snapshots": ring.stats() if ring is not None else None,
+    }
 
-        # Highscore (below score)
-        highscore_text = self.font.render(f"Highscore: {self.highscore}", True, WHITE)
-        self.screen.blit(highscore_text, (SCREEN_WIDTH - highscore_text.get_width() - 10, 40))
 
 # --- Entry Point ---
+def window_size(text):
+    """Parse a WIDTHxHEIGHT window size for argparse"""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError("window needs a positive width and height")
+    return width, height
+
+
+def formation_size(text):
+    """Parse a ROWSxCOLS formation size for argparse"""
+    try:
+        rows, cols = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, got {text!r}")
+    if rows < 1 or cols < 1:
+        raise argparse.ArgumentTypeError("formation needs at least one row and one column")
+    return rows, cols
+
+
+def main(argv=None):
+    """Parse command line options and start the game or a headless run"""
+    parser = argparse.ArgumentParser(description="VC-SpaceInvaders")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without a window and report steps per second")
+    parser.add_argument("--steps", type=int, default=100000,
+                        help="number of simulation ticks for --headless (default: 100000)")
+    parser.add_argument("--snapshots", action="store_true",
+                        help="with --headless, snapshot and restore the game every tick and "
+                             "report snapshot size and cost")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="present only changed screen areas instead of flipping every frame")
+    parser.add_argument("--window", type=window_size, default=None, metavar="WIDTHxHEIGHT",
+                        help=f"window size; the scene is drawn at {SCREEN_WIDTH}x{SCREEN_HEIGHT} "
+                             f"and scaled once per frame (default: {SCREEN_WIDTH}x{SCREEN_HEIGHT})")
+    parser.add_argument("--stretch", action="store_true",
+                        help="with --window, stretch to fit instead of scaling by a whole factor")
+    parser.add_argument("--no-particles", action="store_true",
+                        help="turn off explosion and debris particles")
+    parser.add_argument("--audio-buffer", type=int, default=MIXER_BUFFER, metavar="SAMPLES",
+                        help=f"mixer buffer size; smaller lowers sound latency but costs more CPU "
+                             f"(default: {MIXER_BUFFER})")
+    parser.add_argument("--audio-frequency", type=int, default=MIXER_FREQUENCY, metavar="HZ",
+                        help=f"mixer sample rate (default: {MIXER_FREQUENCY})")
+    parser.add_argument("--glyph-hud", action="store_true",
+                        help="compose score digits from a pre-rendered glyph strip")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help=f"render rate cap, 0 for uncapped (default: {FPS}); "
+                             f"the simulation always runs at {FPS} ticks per second")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="time every frame phase and export the ring buffer to PATH "
+                             "(.json or .csv) on exit")
+    parser.add_argument("--latency", metavar="PATH", nargs="?", const="",
+                        help="measure input-to-present latency, print percentiles on exit "
+                             "and write the histograms to PATH (.json) if given")
+    parser.add_argument("--memory", metavar="PATH", nargs="?", const="",
+                        help="log entity counts, Surface bytes and tracemalloc deltas at every "
+                             "wave and write the samples to PATH (.json or .csv) if given")
+    parser.add_argument("--spectate", metavar="ADDRESS",
+                        help="stream the game to spectators on host:port or a Unix socket path "
+                             "(watch with: python spectator.py watch --connect ADDRESS)")
+    parser.add_argument("--late-latch", action="store_true",
+                        help="sleep before sampling input and sample it right before each tick")
+    parser.add_argument("--profile-overlay", action="store_true",
+                        help="show p50/p99 frame times on screen")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for the game's random number generator")
+    parser.add_argument("--formation", type=formation_size, default=None, metavar="ROWSxCOLS",
+                        help="alien grid size (default: 5x11, or the recorded size with --replay)")
+    parser.add_argument("--leaderboard", action="store_true",
+                        help="print the saved leaderboard and exit")
+    parser.add_argument("--no-pack", action="store_true",
+                        help="decode strip.png even when a baked assets.pack exists")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the session's input to a replay file")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="re-simulate a recorded session at uncapped speed")
+    parser.add_argument("--seek", type=int, default=None, metavar="TICK",
+                        help="with --replay, stop at this tick instead of the end")
+    parser.add_argument("--watch", action="store_true",
+                        help="with --replay, show the replay in a window from the --seek tick")
+    args = parser.parse_args(argv)
+
+    replay = None
+    if args.replay:
+        replay = Replay.load(args.replay)
+        if args.formation is not None and args.formation != replay.formation:
+            parser.error(f"--formation {args.formation[0]}x{args.formation[1]} does not match the "
+                         f"{replay.formation[0]}x{replay.formation[1]} formation the replay was "
+                         f"recorded with")
+        args.formation = replay.formation
+    elif args.formation is None:
+        args.formation = (FORMATION_ROWS, FORMATION_COLS)
+
+    if args.headless:
+        result = run_headless_benchmark(args.steps, formation=args.formation,
+                                        snapshots=args.snapshots)
+        print(f"{result['steps']} steps in {result['seconds']:.2f}s "
+              f"({result['steps_per_second']:.0f} steps/s), "
+              f"{result['games']} games, {result['waves']} waves")
+        print(f"time to first frame: {result['first_frame_ms']:.1f} ms")
+        print(describe_assets(result["assets"]))
+        atlas = result["atlas"]
+        print(f"frame atlas: {atlas['frames']} frames, {atlas['bytes']} bytes, "
+              f"{atlas['hits']} hits, {atlas['misses']} misses")
+        for name, pool in result["pools"].items():
+            print(f"{name} pool: {pool['allocations']} allocated, {pool['reuses']} reused, "
+                  f"high water {pool['high_water']}")
+        snapshots = result["snapshots"]
+        if snapshots:
+            print(f"snapshots: {snapshots['mean_bytes']:.0f} bytes each, "
+                  f"{snapshots['ring_bytes']} bytes in the ring, "
+                  f"save {snapshots['save_us']:.1f} us, restore {snapshots['restore_us']:.1f} us")
+        return
+
+    asset_pack = None if args.no_pack else ASSET_PACK_PATH
+
+    if args.leaderboard:
+        scores = ScoreStore()
+        scores.close()
+        for rank, (score, wave, recorded_at) in enumerate(scores.leaderboard(), 1):
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(recorded_at))
+            print(f"{rank:2}. {score:7}  wave {wave:3}  {when}")
+        return
+
+    if replay is not None:
+        game = Game(headless=not args.watch, dirty_rects=args.dirty_rects,
+                    glyph_hud=args.glyph_hud, seed=replay.seed, asset_pack=asset_pack,
+                    score_db=None, formation=replay.formation, window_size=args.window,
+                    integer_scale=not args.stretch, config=replay.config)
+        stop = replay.ticks if args.seek is None else args.seek
+        start = time.perf_counter()
+        ticks = replay.seek(game, stop)
+        elapsed = time.perf_counter() - start
+        print(f"replayed {ticks}/{replay.ticks} ticks in {elapsed:.2f}s "
+              f"({ticks / elapsed if elapsed > 0 else float('inf'):.0f} ticks/s): "
+              f"score {game.score}, lives {game.player.lives}, wave {game.wave_number}")
+        if args.watch:
+            game.watch_replay(replay, ticks)
+        return
+
+    game = Game(dirty_rects=args.dirty_rects, glyph_hud=args.glyph_hud, seed=args.seed,
+                profile=bool(args.profile), profile_overlay=args.profile_overlay,
+                render_fps=args.fps, asset_pack=asset_pack, formation=args.formation,
+                latency=args.latency is not None, late_latch=args.late_latch,
+                window_size=args.window, integer_scale=not args.stretch,
+                particles=not args.no_particles, audio_frequency=args.audio_frequency,
+                audio_buffer=args.audio_buffer, memory=args.memory is not None)
+    if args.spectate:
+        from spectator import SpectatorServer  # spectator.py imports this module
+        game.spectator = SpectatorServer(args.spectate)
+    if args.record:
+        game.start_recording()
+    game.run(record_path=args.record, profile_path=args.profile, latency_path=args.latency or None,
+             memory_path=args.memory or None)
+
+
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    main()
@@ -0,0 +1,124 @@
+"""Memory leak regression harness: play hundreds of headless waves and fail unless memory plateaus"""
+import argparse
+import sys
+import time
+
+from main import Game, MemoryTracker, autopilot
+
+WAVES = 300
+WAVE_TICKS = 240  # ticks of play per wave before the survivors are cleared
+WARMUP_WAVES = 50  # samples ignored while caches and pools fill up
+TOLERANCE = 64  # bytes per wave of growth allowed after the warm-up
+
+# Fields whose growth fails the check; the rest are reported only
+CHECKED_FIELDS = ("traced_bytes", "surface_bytes", "surfaces")
+
+
+def play_waves(waves, wave_ticks=WAVE_TICKS, warmup=WARMUP_WAVES, seed=0, draw=False,
+               particles=False, log=False, progress=None):
+    """
+    Play headless waves until the tracker has sampled the given number of them
+
+    The autopilot plays each wave for wave_ticks ticks; whatever aliens survive
+    are then killed so the game advances through its normal wave-clear path.
+    When the player runs out of lives the game is reset, which is sampled as
+    a wave too.
+
+    Args:
+        draw: Render every tick to the offscreen surface as well
+        particles: Enable the particle system
+        log: Print the tracker's line for every wave
+        progress: Optional callback(done, total) called after every wave
+
+    Returns:
+        (MemoryTracker, ticks played, elapsed seconds); the tracker's mark()
+        was taken once warmup waves had been sampled, so its snapshot is part
+        of every later sample
+    """
+    tracker = MemoryTracker(capacity=waves + 1, log=log, collect=True)
+    game = Game(headless=True, seed=seed, score_db=None, particles=particles)
+    game.memory = tracker
+    game.reset(seed)  # restart so the first wave is sampled too
+    ticks = 0
+    wave_start = 0
+    start = time.perf_counter()
+    while tracker.count < waves:
+        sampled = tracker.count
+        if not game.running:
+            game.reset()
+        elif ticks - wave_start >= wave_ticks:
+            game.aliens.kill(game.aliens.alive_indices())
+        autopilot(game)
+        ticks += game.simulate(1)
+        if draw:
+            game.draw()
+        if tracker.count != sampled:
+            wave_start = ticks
+            if tracker.count == warmup:
+                tracker.mark()
+            if progress:
+                progress(tracker.count, waves)
+    return tracker, ticks, time.perf_counter() - start
+
+
+def check(tracker, warmup=WARMUP_WAVES, tolerance=TOLERANCE):
+    """
+    Compare post-warm-up growth per wave against the tolerance
+
+    Returns:
+        Dict of field -> (bytes or count grown per wave, whether it is within tolerance)
+    """
+    results = {}
+    for field in ("traced_bytes", "surface_bytes", "surfaces", "rss_bytes", "pooled"):
+        slope = tracker.slope(field, warmup)
+        results[field] = (slope, field not in CHECKED_FIELDS or slope <= tolerance)
+    return results
+
+
+# --- Entry Point ---
+def main(argv=None):
+    """Run the harness; returns exit status 1 if memory keeps growing after the warm-up"""
+    parser = argparse.ArgumentParser(description="VC-SpaceInvaders memory leak regression harness")
+    parser.add_argument("--waves", type=int, default=WAVES, help=f"waves to play (default: {WAVES})")
+    parser.add_argument("--wave-ticks", type=int, default=WAVE_TICKS,
+                        help=f"ticks played per wave before it is cleared (default: {WAVE_TICKS})")
+    parser.add_argument("--warmup", type=int, default=WARMUP_WAVES,
+                        help=f"waves excluded from the growth fit (default: {WARMUP_WAVES})")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help=f"allowed growth in bytes per wave (default: {TOLERANCE})")
+    parser.add_argument("--seed", type=int, default=0, help="game seed (default: 0)")
+    parser.add_argument("--draw", action="store_true", help="render every tick offscreen too")
+    parser.add_argument("--particles", action="store_true", help="enable the particle system")
+    parser.add_argument("--log", action="store_true", help="print the memory line for every wave")
+    parser.add_argument("--output", metavar="PATH", help="write the samples to PATH (.json or .csv)")
+    args = parser.parse_args(argv)
+    if args.waves <= args.warmup + 1:
+        parser.error("--waves must exceed --warmup by at least two")
+
+    def progress(done, total):
+        if not args.log and (done % max(1, total // 20) == 0 or done == total):
+            print(f"\r{done}/{total} waves", end="", file=sys.stderr, flush=True)
+
+    tracker, ticks, elapsed = play_waves(args.waves, args.wave_ticks, args.warmup, seed=args.seed,
+                                         draw=args.draw, particles=args.particles, log=args.log,
+                                         progress=progress)
+    print(file=sys.stderr)
+    print(f"{tracker.count} waves, {ticks} ticks in {elapsed:.2f}s")
+
+    results = check(tracker, args.warmup, args.tolerance)
+    for field, (slope, ok) in results.items():
+        print(f"{field}: {slope:+.1f} per wave after wave {args.warmup}"
+              f"{'' if ok else '  FAIL'}")
+    if args.output:
+        tracker.export(args.output)
+    failed = not all(ok for _, ok in results.values())
+    if failed:
+        print("memory did not plateau; largest growth since the warm-up:")
+        for site, size, blocks in tracker.top_growth():
+            print(f"  {size:+9d} B {blocks:+6d} blocks  {site}")
+    tracker.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,689 @@
+"""Live spectating over a local socket: compact per-tick state deltas plus periodic keyframes"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import struct
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from main import (Game, GameConfig, AssetManager, AlienFormation, AlienBullet, Bullet, Bunker,
+                  Player, UFO, HudText, autopilot, formation_size, _read_varint, _write_varint,
+                  ASSET_PACK_PATH, BUNKER_BITS_SIZE, FORMATION_COLS, FORMATION_ROWS, FPS, SCREEN_HEIGHT,
+                  SCREEN_WIDTH, SPRITE_SHEET_PATH, BLACK, HUD_FONT_SIZE)
+
+DEFAULT_ADDRESS = "127.0.0.1:7777"
+KEYFRAME_INTERVAL = 120  # ticks between full keyframes (two seconds at 60 FPS)
+MAX_BACKLOG = 1 << 20  # bytes queued for one client before it is dropped as too slow
+ENCODE_SAMPLES = 3600  # encode times kept for percentiles
+
+# --- Wire Format ---
+# Every message is a little-endian u32 length followed by the body. A body
+# starts with its type byte and a varint tick number.
+MESSAGE_LENGTH = struct.Struct("<I")
+POINT = struct.Struct("<hh")
+KEYFRAME = 1
+DELTA = 2
+
+# Delta sections, present when their flag is set, in this order
+DELTA_SCORE = 0x001
+DELTA_LIVES = 0x002
+DELTA_PLAYER = 0x004
+DELTA_ORIGIN = 0x008
+DELTA_FRAME = 0x010
+DELTA_KILLS = 0x020
+DELTA_BUNKERS = 0x040
+DELTA_BULLETS = 0x080
+DELTA_BOMBS = 0x100
+DELTA_UFO = 0x200
+DELTA_GAME_OVER = 0x400
+
+# Keyframe bunker status bytes
+BUNKER_DESTROYED = 0
+BUNKER_INTACT = 1
+BUNKER_DAMAGED = 2  # followed by the packed pixels from Bunker.bits()
+
+
+def parse_address(text):
+    """Return (family, address) for "host:port" or a Unix socket path"""
+    if text.startswith("unix:") or "/" in text:
+        return socket.AF_UNIX, text[5:] if text.startswith("unix:") else text
+    host, _, port = text.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def _write_points(buffer, points):
+    """Append a varint count and (serial, x, y) triples"""
+    _write_varint(buffer, len(points))
+    for serial, x, y in points:
+        _write_varint(buffer, serial)
+        buffer += POINT.pack(x, y)
+
+
+def _read_points(data, pos):
+    """Read (serial, x, y) triples written by _write_points"""
+    count, pos = _read_varint(data, pos)
+    points = []
+    for _ in range(count):
+        serial, pos = _read_varint(data, pos)
+        x, y = POINT.unpack_from(data, pos)
+        points.append((serial, x, y))
+        pos += POINT.size
+    return points, pos
+
+
+# --- Encoder ---
+class StateEncoder:
+    """
+    Turns the game state after each tick into a keyframe or a delta
+
+    Deltas only carry what changed since the previous tick. Bullets move at
+    a constant speed, so only their spawns (with a position) and despawns
+    are sent; clients advance the rest themselves, at the speeds of the
+    game's config, which keyframes carry. A new formation (a new wave or
+    game) always forces a keyframe.
+    """
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.tick = 0
+        self.previous = None  # state snapshot the next delta is relative to
+        self.bunkers = []  # bunkers as listed in the last keyframe; deltas index into this
+        self.config = GameConfig()  # config of the game in the last keyframe
+
+    def snapshot(self, game):
+        """Capture the fields spectators see"""
+        aliens = game.aliens
+        return {
+            "score": game.score,
+            "lives": game.player.lives,
+            "wave": game.wave_number,
+            "running": game.running,
+            "player": game.player.rect.topleft,
+            "aliens": aliens,
+            "count": len(aliens),
+            "alive": aliens.alive.copy(),
+            "origin": (int(aliens.origin_x), int(aliens.origin_y)),
+            "frame": int(aliens.frame[0]) if aliens.size else 0,
+            "impacts": [len(bunker.impacts) if bunker.alive() else -1 for bunker in self.bunkers],
+            "bullets": {bullet.serial: bullet.rect.center for bullet in game.bullets},
+            "bombs": {bomb.serial: bomb.rect.center for bomb in game.alien_bullets},
+            "ufo": game.ufo.sprite.rect.topleft if game.ufo.sprite else None,
+        }
+
+    def encode(self, game, keyframe=False):
+        """
+        Advance one tick and encode it
+
+        Returns:
+            (body, is_keyframe)
+        """
+        self.tick += 1
+        previous = self.previous
+        if (keyframe or previous is None or game.aliens is not previous["aliens"]
+                or self.tick % self.keyframe_interval == 0):
+            self.bunkers = game.bunkers.sprites()
+            self.config = game.config
+            self.previous = self.snapshot(game)
+            return self.keyframe(), True
+        self.previous = self.snapshot(game)
+        return self.delta(previous, self.previous), False
+
+    def keyframe(self):
+        """Encode a full keyframe of the last snapshot"""
+        state = self.previous
+        aliens = state["aliens"]
+        body = bytearray([KEYFRAME])
+        _write_varint(body, self.tick)
+        for value in (state["score"], max(state["lives"], 0), state["wave"], int(state["running"])):
+            _write_varint(body, value)
+        overrides = json.dumps(self.config.overrides(), sort_keys=True).encode("utf-8")
+        _write_varint(body, len(overrides))
+        body += overrides
+        body += POINT.pack(*state["player"])
+
+        for value in (aliens.rows, aliens.cols, aliens.spacing_x, aliens.spacing_y, state["frame"]):
+            _write_varint(body, value)
+        body += POINT.pack(*state["origin"])
+        body += np.packbits(state["alive"]).tobytes()
+
+        _write_varint(body, len(self.bunkers))
+        for bunker, impacts in zip(self.bunkers, state["impacts"]):
+            body += POINT.pack(*bunker.rect.center)
+            if impacts < 0:
+                body.append(BUNKER_DESTROYED)
+            elif bunker.damaged:
+                body.append(BUNKER_DAMAGED)
+                body += bunker.bits()
+            else:
+                body.append(BUNKER_INTACT)
+
+        _write_points(body, [(serial, x, y) for serial, (x, y) in state["bullets"].items()])
+        _write_points(body, [(serial, x, y) for serial, (x, y) in state["bombs"].items()])
+        if state["ufo"] is None:
+            body.append(0)
+        else:
+            body.append(1)
+            body += POINT.pack(*state["ufo"])
+        return bytes(body)
+
+    def delta(self, previous, state):
+        """Encode what changed between two snapshots of the same formation"""
+        flags = 0
+        sections = bytearray()
+        if state["score"] != previous["score"]:
+            flags |= DELTA_SCORE
+            _write_varint(sections, state["score"])
+        if state["lives"] != previous["lives"]:
+            flags |= DELTA_LIVES
+            _write_varint(sections, max(state["lives"], 0))
+        if state["player"] != previous["player"]:
+            flags |= DELTA_PLAYER
+            sections += POINT.pack(*state["player"])
+        if state["origin"] != previous["origin"]:
+            flags |= DELTA_ORIGIN
+            sections += POINT.pack(*state["origin"])
+        if state["frame"] != previous["frame"]:
+            flags |= DELTA_FRAME
+        if state["count"] != previous["count"]:
+            flags |= DELTA_KILLS
+            killed = np.flatnonzero(previous["alive"] & ~state["alive"]).tolist()
+            _write_varint(sections, len(killed))
+            last = 0
+            for slot in killed:  # ascending, so store gaps
+                _write_varint(sections, slot - last)
+                last = slot
+        if state["impacts"] != previous["impacts"]:
+            # New craters only; the client erodes the same craters and gets the same pixels
+            flags |= DELTA_BUNKERS
+            changed = [i for i, (now, before) in enumerate(zip(state["impacts"], previous["impacts"]))
+                       if now != before]
+            _write_varint(sections, len(changed))
+            for index in changed:
+                impacts = self.bunkers[index].impacts[max(previous["impacts"][index], 0):]
+                _write_varint(sections, index)
+                _write_varint(sections, len(impacts))
+                for point in impacts:
+                    sections += POINT.pack(*point)
+        for flag, key in ((DELTA_BULLETS, "bullets"), (DELTA_BOMBS, "bombs")):
+            now, before = state[key], previous[key]
+            if now.keys() != before.keys():
+                flags |= flag
+                _write_points(sections, [(serial, *now[serial]) for serial in now.keys() - before.keys()])
+                gone = before.keys() - now.keys()
+                _write_varint(sections, len(gone))
+                for serial in gone:
+                    _write_varint(sections, serial)
+        if state["ufo"] != previous["ufo"]:
+            flags |= DELTA_UFO
+            if state["ufo"] is None:
+                sections.append(0)
+            else:
+                sections.append(1)
+                sections += POINT.pack(*state["ufo"])
+        if not state["running"]:
+            flags |= DELTA_GAME_OVER
+
+        body = bytearray([DELTA])
+        _write_varint(body, self.tick)
+        _write_varint(body, flags)
+        body += sections
+        return bytes(body)
+
+
+# --- Server ---
+class SpectatorServer:
+    """
+    Streams encoded ticks to every connected spectator
+
+    Runs inside the game loop without threads: the listening socket and the
+    client sockets are non-blocking, and each client has an outgoing buffer.
+    New clients get a keyframe first; clients that fall more than
+    MAX_BACKLOG bytes behind are dropped.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, keyframe_interval=KEYFRAME_INTERVAL):
+        family, self.address = parse_address(address)
+        self.listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(self.address)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.encoder = StateEncoder(keyframe_interval)
+        self.clients = {}  # socket -> pending outgoing bytes
+        self.ticks = 0
+        self.bytes_encoded = 0  # one copy of every message, regardless of client count
+        self.bytes_sent = 0
+        self.keyframes = 0
+        self.encode_ms = []  # most recent ENCODE_SAMPLES encode times
+        self.dropped = 0
+
+    def broadcast(self, game):
+        """Encode the tick that just ran and queue it for every client"""
+        start = time.perf_counter()
+        body, is_keyframe = self.encoder.encode(game)
+        message = MESSAGE_LENGTH.pack(len(body)) + body
+        elapsed = (time.perf_counter() - start) * 1000
+        if len(self.encode_ms) == ENCODE_SAMPLES:
+            del self.encode_ms[0]
+        self.encode_ms.append(elapsed)
+        self.ticks += 1
+        self.bytes_encoded += len(message)
+        self.keyframes += is_keyframe
+
+        for client in self.clients:
+            self.clients[client] += message
+        self._accept()
+        self._flush()
+
+    def _accept(self):
+        """Take new connections and start them on a keyframe of the current state"""
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            client.setblocking(False)
+            if client.family == socket.AF_INET:
+                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            keyframe = self.encoder.keyframe() if self.encoder.previous is not None else b""
+            self.clients[client] = bytearray(MESSAGE_LENGTH.pack(len(keyframe)) + keyframe
+                                             if keyframe else b"")
+
+    def _flush(self):
+        """Send as much queued data as each socket accepts without blocking"""
+        for client, pending in list(self.clients.items()):
+            try:
+                while pending:
+                    sent = client.send(pending)
+                    self.bytes_sent += sent
+                    del pending[:sent]
+            except (BlockingIOError, InterruptedError):
+                if len(pending) > MAX_BACKLOG:
+                    self._drop(client)
+            except OSError:
+                self._drop(client)
+
+    def _drop(self, client):
+        """Disconnect a client"""
+        self.dropped += 1
+        del self.clients[client]
+        client.close()
+
+    def stats(self):
+        """Return bandwidth and encode-time counters"""
+        times = self.encode_ms or [0.0]
+        return {
+            "ticks": self.ticks,
+            "clients": len(self.clients),
+            "dropped": self.dropped,
+            "keyframes": self.keyframes,
+            "bytes_per_tick": self.bytes_encoded / self.ticks if self.ticks else 0.0,
+            "bytes_sent": self.bytes_sent,
+            "encode_ms_mean": statistics.fmean(times),
+            "encode_ms_p99": float(np.percentile(times, 99)),
+        }
+
+    def describe(self):
+        """One-line summary of stats()"""
+        stats = self.stats()
+        return (f"spectators: {stats['ticks']} ticks, {stats['bytes_per_tick']:.1f} bytes/tick, "
+                f"{stats['keyframes']} keyframes, encode mean {stats['encode_ms_mean'] * 1000:.1f} us "
+                f"p99 {stats['encode_ms_p99'] * 1000:.1f} us, {stats['clients']} clients, "
+                f"{stats['dropped']} dropped")
+
+    def close(self):
+        """Close every socket"""
+        for client in list(self.clients):
+            client.close()
+        self.clients.clear()
+        self.listener.close()
+        if self.listener.family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+
+# --- Client ---
+class SpectatorView:
+    """
+    Local mirror of a streamed game, drawn with the game's own sprite classes
+    """
+
+    def __init__(self, sprite_sheet, bunker_shape):
+        self.sprite_sheet = sprite_sheet
+        self.bunker_shape = bunker_shape
+        self.tick = 0
+        self.score = 0
+        self.lives = 0
+        self.wave = 0
+        self.running = True
+        self.synced = False  # False until the first keyframe arrives
+        self.config = GameConfig()  # the server game's config, from the last keyframe
+        self.player = Player(sprite_sheet)
+        self.aliens = AlienFormation(sprite_sheet, FORMATION_ROWS, FORMATION_COLS)
+        self.bunkers = []
+        self.bunker_group = pygame.sprite.Group()
+        self.bullets = {}  # serial -> Bullet
+        self.bombs = {}  # serial -> AlienBullet
+        self.sprites = pygame.sprite.Group()
+        self.ufo = pygame.sprite.GroupSingle()
+
+    def apply(self, body):
+        """Apply one keyframe or delta message body"""
+        kind = body[0]
+        tick, pos = _read_varint(body, 1)
+        if kind == KEYFRAME:
+            self._apply_keyframe(body, pos)
+            self.synced = True
+        elif kind == DELTA and self.synced:
+            self._apply_delta(body, pos)
+        self.tick = tick
+
+    def _spawn(self, table, cls, points):
+        speed = self.config.bullet_speed if cls is Bullet else self.config.alien_bullet_speed
+        for serial, x, y in points:
+            sprite = cls(x, y, self.sprite_sheet, speed)
+            table[serial] = sprite
+            self.sprites.add(sprite)
+
+    def _despawn(self, table, serials):
+        for serial in serials:
+            sprite = table.pop(serial, None)
+            if sprite is not None:
+                sprite.kill()
+
+    def _set_ufo(self, topleft):
+        if topleft is None:
+            self.ufo.empty()
+            return
+        if self.ufo.sprite is None:
+            self.ufo.add(UFO())
+        self.ufo.sprite.rect.topleft = topleft
+
+    def _apply_keyframe(self, body, pos):
+        self.score, pos = _read_varint(body, pos)
+        self.lives, pos = _read_varint(body, pos)
+        self.wave, pos = _read_varint(body, pos)
+        running, pos = _read_varint(body, pos)
+        self.running = bool(running)
+        length, pos = _read_varint(body, pos)
+        self.config = GameConfig(**json.loads(body[pos:pos + length].decode("utf-8")))
+        pos += length
+        self.player.rect.topleft = POINT.unpack_from(body, pos)
+        pos += POINT.size
+
+        values = []
+        for _ in range(5):
+            value, pos = _read_varint(body, pos)
+            values.append(value)
+        rows, cols, spacing_x, spacing_y, frame = values
+        origin = POINT.unpack_from(body, pos)
+        pos += POINT.size
+        size = rows * cols
+        alive_bytes = (size + 7) // 8
+        alive = np.unpackbits(np.frombuffer(body, np.uint8, alive_bytes, pos), count=size).astype(bool)
+        pos += alive_bytes
+        self.aliens = AlienFormation(self.sprite_sheet, rows, cols, spacing_x, spacing_y, *origin)
+        self.aliens.kill(np.flatnonzero(~alive))
+        self.aliens.frame[:] = frame
+
+        count, pos = _read_varint(body, pos)
+        self.bunker_group.empty()
+        self.bunkers = []
+        for _ in range(count):
+            center = POINT.unpack_from(body, pos)
+            status = body[pos + POINT.size]
+            pos += POINT.size + 1
+            bunker = Bunker(*center, self.bunker_shape)
+            self.bunkers.append(bunker)
+            if status == BUNKER_DAMAGED:
+                bunker.load_bits(body[pos:pos + BUNKER_BITS_SIZE])
+                pos += BUNKER_BITS_SIZE
+            if status != BUNKER_DESTROYED:
+                self.bunker_group.add(bunker)
+
+        for table in (self.bullets, self.bombs):
+            self._despawn(table, list(table))
+        bullets, pos = _read_points(body, pos)
+        bombs, pos = _read_points(body, pos)
+        self._spawn(self.bullets, Bullet, bullets)
+        self._spawn(self.bombs, AlienBullet, bombs)
+        self._set_ufo(POINT.unpack_from(body, pos + 1) if body[pos] else None)
+
+    def _apply_delta(self, body, pos):
+        # Bullets move at a constant speed; only spawns and despawns are sent
+        for sprite in self.sprites:
+            sprite.rect.y += sprite.speed
+
+        flags, pos = _read_varint(body, pos)
+        if flags & DELTA_SCORE:
+            self.score, pos = _read_varint(body, pos)
+        if flags & DELTA_LIVES:
+            self.lives, pos = _read_varint(body, pos)
+        if flags & DELTA_PLAYER:
+            self.player.rect.topleft = POINT.unpack_from(body, pos)
+            pos += POINT.size
+        if flags & DELTA_ORIGIN:
+            self.aliens.origin_x, self.aliens.origin_y = (float(v) for v in POINT.unpack_from(body, pos))
+            pos += POINT.size
+        if flags & DELTA_FRAME:
+            self.aliens.frame ^= 1
+        if flags & DELTA_KILLS:
+            count, pos = _read_varint(body, pos)
+            slots = []
+            slot = 0
+            for _ in range(count):
+                gap, pos = _read_varint(body, pos)
+                slot += gap
+                slots.append(slot)
+            self.aliens.kill(slots)
+        if flags & DELTA_BUNKERS:
+            count, pos = _read_varint(body, pos)
+            for _ in range(count):
+                index, pos = _read_varint(body, pos)
+                impacts, pos = _read_varint(body, pos)
+                for _ in range(impacts):
+                    self.bunkers[index].erode(POINT.unpack_from(body, pos))
+                    pos += POINT.size
+        for flag, table, cls in ((DELTA_BULLETS, self.bullets, Bullet),
+                                 (DELTA_BOMBS, self.bombs, AlienBullet)):
+            if flags & flag:
+                spawned, pos = _read_points(body, pos)
+                count, pos = _read_varint(body, pos)
+                gone = []
+                for _ in range(count):
+                    serial, pos = _read_varint(body, pos)
+                    gone.append(serial)
+                self._despawn(table, gone)
+                self._spawn(table, cls, spawned)
+        if flags & DELTA_UFO:
+            present = body[pos]
+            self._set_ufo(POINT.unpack_from(body, pos + 1) if present else None)
+            pos += 1 + POINT.size * present
+        self.running = not flags & DELTA_GAME_OVER
+
+    def draw(self, screen, hud):
+        """Render the mirrored state"""
+        screen.fill(BLACK)
+        screen.blit(self.player.image, self.player.rect)
+        self.sprites.draw(screen)
+        self.aliens.draw(screen)
+        self.bunker_group.draw(screen)
+        self.ufo.draw(screen)
+        screen.blit(hud["lives"].render(self.lives), (10, 10))
+        screen.blit(hud["score"].render(self.score), (10, 40))
+        screen.blit(hud["wave"].render(self.wave), (SCREEN_WIDTH - 150, 10))
+
+
+class SpectatorClient:
+    """Connection to a SpectatorServer that splits the stream into message bodies"""
+
+    def __init__(self, address=DEFAULT_ADDRESS):
+        family, address = parse_address(address)
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.connect(address)
+        self.socket.setblocking(False)
+        self.buffer = bytearray()
+        self.bytes_received = 0
+        self.connected = True
+
+    def receive(self):
+        """Return every complete message body received so far"""
+        try:
+            while True:
+                chunk = self.socket.recv(65536)
+                if not chunk:
+                    self.connected = False
+                    break
+                self.buffer += chunk
+                self.bytes_received += len(chunk)
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self.connected = False
+
+        bodies = []
+        pos = 0
+        while len(self.buffer) - pos >= MESSAGE_LENGTH.size:
+            (length,) = MESSAGE_LENGTH.unpack_from(self.buffer, pos)
+            end = pos + MESSAGE_LENGTH.size + length
+            if end > len(self.buffer):
+                break
+            bodies.append(bytes(self.buffer[pos + MESSAGE_LENGTH.size:end]))
+            pos = end
+        del self.buffer[:pos]
+        return bodies
+
+    def close(self):
+        self.socket.close()
+
+
+# --- Self-Check ---
+def mirror_check(ticks=3000, config=None, keyframe_interval=KEYFRAME_INTERVAL, seed=0):
+    """
+    Feed an autopilot game through a StateEncoder into a SpectatorView
+
+    Returns:
+        Number of ticks after which the view's player, score, lives, alien
+        grid, bullets, bombs or UFO differ from the game's
+    """
+    game = Game(headless=True, seed=seed, score_db=None, config=config)
+    encoder = StateEncoder(keyframe_interval)
+    view = SpectatorView(game.sprite_sheet, game.bunker_shape)
+    mismatched = 0
+    for _ in range(ticks):
+        if not game.running:
+            game.reset()
+        autopilot(game)
+        game.input_direction = game.player.direction
+        game.pending_fire = True
+        game.step()
+        view.apply(encoder.encode(game)[0])
+        aliens = game.aliens
+        ufo = game.ufo.sprite.rect.topleft if game.ufo.sprite else None
+        if ((view.score, view.lives, view.player.rect.topleft) !=
+                (game.score, max(game.player.lives, 0), game.player.rect.topleft)
+                or (view.aliens.origin_x, view.aliens.origin_y) != (aliens.origin_x, aliens.origin_y)
+                or not np.array_equal(view.aliens.alive, aliens.alive)
+                or {serial: sprite.rect.center for serial, sprite in view.bullets.items()}
+                != {bullet.serial: bullet.rect.center for bullet in game.bullets}
+                or {serial: sprite.rect.center for serial, sprite in view.bombs.items()}
+                != {bomb.serial: bomb.rect.center for bomb in game.alien_bullets}
+                or (view.ufo.sprite.rect.topleft if view.ufo.sprite else None) != ufo):
+            mismatched += 1
+    return mismatched
+
+
+# --- Entry Points ---
+def serve(address, ticks, keyframe_interval, formation):
+    """Run an autopilot game headlessly in real time and stream it"""
+    game = Game(headless=True, formation=formation)
+    game.spectator = SpectatorServer(address, keyframe_interval)
+    print(f"serving on {address}")
+    clock = pygame.time.Clock()
+    try:
+        for _ in range(ticks):
+            if not game.running:
+                game.reset()
+            autopilot(game)
+            game.input_direction = game.player.direction
+            game.pending_fire = True
+            game.step()
+            clock.tick(FPS)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        game.spectator.close()
+        print(game.spectator.describe())
+
+
+def watch(address):
+    """Open a window that renders a remote game"""
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"VC-SpaceInvaders - spectating {address}")
+    assets = AssetManager()
+    pack = assets.pack(ASSET_PACK_PATH)
+    sheet = pack if pack is not None else assets.image(SPRITE_SHEET_PATH)
+    shape = (pack.bunker_shape() if pack is not None else None) or Bunker.render_shape()
+    font = pygame.font.Font(None, HUD_FONT_SIZE)
+    hud = {"lives": HudText(font, "Lives: "), "score": HudText(font, "Score: "),
+           "wave": HudText(font, "Wave: ")}
+
+    view = SpectatorView(sheet, shape)
+    client = SpectatorClient(address)
+    clock = pygame.time.Clock()
+    messages = 0
+    start = time.perf_counter()
+    while client.connected:
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            break
+        for body in client.receive():
+            view.apply(body)
+            messages += 1
+        if view.synced:
+            view.draw(screen, hud)
+            pygame.display.flip()
+        clock.tick(FPS)
+    client.close()
+    elapsed = time.perf_counter() - start
+    print(f"received {messages} messages, {client.bytes_received} bytes "
+          f"({client.bytes_received / max(messages, 1):.1f} bytes/tick) in {elapsed:.1f}s")
+    pygame.quit()
+
+
+def main(argv=None):
+    """Serve a demo game or watch a running one"""
+    parser = argparse.ArgumentParser(description="VC-SpaceInvaders spectator server and client")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="stream an autopilot game")
+    serve_parser.add_argument("--listen", default=DEFAULT_ADDRESS,
+                              help=f"host:port or Unix socket path (default: {DEFAULT_ADDRESS})")
+    serve_parser.add_argument("--ticks", type=int, default=10 ** 9, help="ticks to run")
+    serve_parser.add_argument("--keyframe-interval", type=int, default=KEYFRAME_INTERVAL,
+                              help=f"ticks between keyframes (default: {KEYFRAME_INTERVAL})")
+    serve_parser.add_argument("--formation", type=formation_size,
+                              default=(FORMATION_ROWS, FORMATION_COLS), metavar="ROWSxCOLS",
+                              help=f"alien grid size (default: {FORMATION_ROWS}x{FORMATION_COLS})")
+    watch_parser = commands.add_parser("watch", help="render a streamed game")
+    watch_parser.add_argument("--connect", default=DEFAULT_ADDRESS,
+                              help=f"host:port or Unix socket path (default: {DEFAULT_ADDRESS})")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.listen, args.ticks, args.keyframe_interval, args.formation)
+    else:
+        watch(args.connect)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""Parallel gameplay-balance sweeps: many headless bot games per GameConfig, aggregated into a table"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from main import Game, GameConfig, SIM_TICK_MS, autopilot
+
+MAX_TICKS = 60 * 60 * 30  # give up on a game after 30 simulated minutes
+DODGE_DISTANCE = 120  # pixels above the player in which the dodger reacts to bombs
+
+# Integer fields are rounded when sampled from a range
+INTEGER_FIELDS = {"player_lives", "alien_score", "ufo_score"}
+# Mixed into the game seed to seed the bot, so its choices don't track the game's draws
+POLICY_SEED_SALT = 0x9E3779B9
+
+
+# --- Bot Policies ---
+# A policy is called as policy(game, rng) once per tick. rng is the bot's own
+# random.Random: drawing from game.rng would shift the alien fire and UFO
+# sequence, and configs would no longer be compared on identical patterns.
+def autopilot_policy(game, rng):
+    """Chase the lowest alien and fire constantly"""
+    autopilot(game)
+
+
+def random_policy(game, rng):
+    """Random movement, firing half the time"""
+    game.apply_input(rng.choice((-1, 0, 1)), rng.random() < 0.5)
+
+
+def dodger_policy(game, rng):
+    """Autopilot that sidesteps alien bullets about to reach the player"""
+    player = game.player.rect
+    for bomb in game.alien_bullets:
+        if (abs(bomb.rect.centerx - player.centerx) < player.width
+                and 0 < player.top - bomb.rect.bottom < DODGE_DISTANCE):
+            game.apply_input(1 if bomb.rect.centerx <= player.centerx else -1, True)
+            return
+    autopilot(game)
+
+
+def idle_policy(game, rng):
+    """Stand still and fire constantly"""
+    game.apply_input(0, True)
+
+
+POLICIES = {
+    "autopilot": autopilot_policy,
+    "random": random_policy,
+    "dodger": dodger_policy,
+    "idle": idle_policy,
+}
+
+
+# --- Parameter Space ---
+def parse_values(text):
+    """Parse a NAME=V1,V2,... grid axis for argparse"""
+    name, _, values = text.partition("=")
+    if name not in GameConfig.DEFAULTS or not values:
+        raise argparse.ArgumentTypeError(
+            f"expected NAME=V1,V2,... with NAME one of {', '.join(GameConfig.DEFAULTS)}")
+    try:
+        return name, [float(value) if "." in value else int(value) for value in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad values in {text!r}")
+
+
+def parse_range(text):
+    """Parse a NAME=LOW:HIGH sampling range for argparse"""
+    name, _, bounds = text.partition("=")
+    try:
+        low, high = (float(bound) for bound in bounds.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=LOW:HIGH, got {text!r}")
+    if name not in GameConfig.DEFAULTS:
+        raise argparse.ArgumentTypeError(f"unknown config field {name!r}")
+    return name, (low, high)
+
+
+def grid_configs(axes):
+    """Every combination of the (name, values) axes, as override dicts"""
+    names = [name for name, _ in axes]
+    return [dict(zip(names, values)) for values in itertools.product(*(values for _, values in axes))]
+
+
+def sampled_configs(ranges, count, seed):
+    """count override dicts drawn uniformly from the (name, (low, high)) ranges"""
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(count):
+        overrides = {}
+        for name, (low, high) in ranges:
+            value = rng.uniform(low, high)
+            overrides[name] = round(value) if name in INTEGER_FIELDS else round(value, 3)
+        configs.append(overrides)
+    return configs
+
+
+# --- Workers ---
+def play(task):
+    """
+    Play one headless game to the end and report how it went
+
+    Args:
+        task: (overrides, policy name, seed, max ticks)
+
+    Returns:
+        Dict with the task's overrides and policy plus the final wave, score,
+        simulated seconds to game over and whether the tick limit was hit
+    """
+    overrides, policy_name, seed, max_ticks = task
+    policy = POLICIES[policy_name]
+    game = Game(headless=True, seed=seed, score_db=None, config=GameConfig(**overrides))
+    rng = random.Random(seed ^ POLICY_SEED_SALT)
+    ticks = 0
+    while game.running and ticks < max_ticks:
+        policy(game, rng)
+        ticks += game.simulate(1)
+    return {
+        "overrides": overrides,
+        "policy": policy_name,
+        "seed": seed,
+        "wave": game.wave_number,
+        "score": game.score,
+        "seconds": ticks * SIM_TICK_MS / 1000,
+        "timed_out": game.running,
+    }
+
+
+def run_sweep(configs, policies, games, seed=0, processes=None, max_ticks=MAX_TICKS, progress=None):
+    """
+    Play games for every (config, policy) pair across a process pool
+
+    Every pair is played with the same seeds (seed, seed + 1, ...) so configs
+    are compared on identical alien fire patterns.
+
+    Args:
+        configs: List of GameConfig override dicts
+        policies: Policy names from POLICIES
+        games: Games per (config, policy) pair
+        processes: Worker processes (defaults to the CPU count)
+        progress: Optional callback(done, total) called as games finish
+
+    Returns:
+        List of per-game result dicts from play()
+    """
+    tasks = [(overrides, policy, seed + i, max_ticks)
+             for overrides in configs for policy in policies for i in range(games)]
+    processes = min(processes or os.cpu_count() or 1, len(tasks)) or 1
+    # Small chunks keep every core busy even though game lengths vary widely
+    chunksize = max(1, len(tasks) // (processes * 16))
+    results = []
+    with multiprocessing.Pool(processes) as pool:
+        for result in pool.imap_unordered(play, tasks, chunksize):
+            results.append(result)
+            if progress:
+                progress(len(results), len(tasks))
+    return results
+
+
+def aggregate(results):
+    """
+    Group per-game results by (config, policy)
+
+    Returns:
+        Rows sorted by mean wave then mean score (best first), each a dict
+        of the overrides plus policy, games, wave/score/seconds statistics
+        and the number of games that hit the tick limit
+    """
+    groups = {}
+    for result in results:
+        key = (tuple(sorted(result["overrides"].items())), result["policy"])
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for (overrides, policy), group in groups.items():
+        waves = [result["wave"] for result in group]
+        scores = [result["score"] for result in group]
+        seconds = [result["seconds"] for result in group]
+        rows.append({
+            **dict(overrides),
+            "policy": policy,
+            "games": len(group),
+            "wave_mean": statistics.fmean(waves),
+            "wave_max": max(waves),
+            "score_mean": statistics.fmean(scores),
+            "score_median": statistics.median(scores),
+            "seconds_mean": statistics.fmean(seconds),
+            "seconds_median": statistics.median(seconds),
+            "timeouts": sum(result["timed_out"] for result in group),
+        })
+    rows.sort(key=lambda row: (row["wave_mean"], row["score_mean"]), reverse=True)
+    return rows
+
+
+def format_table(rows):
+    """Render aggregated rows as a fixed-width text table"""
+    if not rows:
+        return "no results"
+    columns = list(rows[0])
+    cells = [[f"{row[column]:.2f}" if isinstance(row[column], float) else str(row[column])
+              for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[i]) for line in cells)) for i, column in enumerate(columns)]
+    lines = ["  ".join(column.rjust(width) for column, width in zip(columns, widths))]
+    lines.extend("  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells)
+    return "\n".join(lines)
+
+
+def write_rows(rows, path):
+    """Write aggregated rows to PATH as .csv or .json"""
+    path = Path(path)
+    if path.suffix == ".csv":
+        with path.open("w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        path.write_text(json.dumps(rows, indent=2))
+
+
+# --- Entry Point ---
+def main(argv=None):
+    """Run a gameplay-balance sweep and print the results table"""
+    parser = argparse.ArgumentParser(
+        description="VC-SpaceInvaders gameplay-balance sweep",
+        epilog=f"config fields: {', '.join(GameConfig.DEFAULTS)}")
+    parser.add_argument("--grid", type=parse_values, action="append", default=[],
+                        metavar="NAME=V1,V2",
+                        help="sweep every listed value of a config field "
+                             "(repeatable, combined as a grid)")
+    parser.add_argument("--range", type=parse_range, action="append", default=[],
+                        metavar="NAME=LOW:HIGH", dest="ranges",
+                        help="sample a config field uniformly (repeatable, use with --samples)")
+    parser.add_argument("--samples", type=int, default=0,
+                        help="random configs drawn from the --range fields")
+    parser.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                        help="bot policy (repeatable, default: autopilot)")
+    parser.add_argument("--games", type=int, default=20,
+                        help="games per config and policy (default: 20)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="first game seed and sampling seed (default: 0)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS,
+                        help=f"tick limit per game (default: {MAX_TICKS})")
+    parser.add_argument("--output", metavar="PATH", help="write the table to PATH (.csv or .json)")
+    args = parser.parse_args(argv)
+
+    if args.ranges and not args.samples:
+        parser.error("--range needs --samples")
+    configs = grid_configs(args.grid) if args.grid else [{}]
+    if args.samples:
+        sampled = sampled_configs(args.ranges, args.samples, args.seed)
+        configs = [{**grid, **sample} for grid in configs for sample in sampled]
+    policies = args.policy or ["autopilot"]
+
+    def progress(done, total):
+        if done % max(1, total // 20) == 0 or done == total:
+            print(f"\r{done}/{total} games", end="", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    results = run_sweep(configs, policies, args.games, seed=args.seed, processes=args.processes,
+                        max_ticks=args.max_ticks, progress=progress)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    rows = aggregate(results)
+    print(format_table(rows))
+    simulated = sum(result["seconds"] for result in results)
+    print(f"{len(results)} games in {elapsed:.2f}s ({len(results) / elapsed:.1f} games/s, "
+          f"{simulated / elapsed:.0f}x real time)")
+    if args.output:
+        write_rows(rows, args.output)
+
+
+if __name__ == "__main__":
+    main()